@@ -0,0 +1,26 @@
+# Helpers shared by the benchmark scripts
+
+"""
+The repository is a set of folders of standalone modules rather than an installed
+package, and most modules print a demo when they are imported. The benchmarks load
+them by file path with that output silenced.
+
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load(relative_path, name):
+  # Import a module from its file path, silencing the demo output it prints on import
+  if ROOT not in sys.path:
+    sys.path.insert(0, ROOT) # modules import their neighbours as folder.module
+  spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+  module = importlib.util.module_from_spec(spec)
+  with contextlib.redirect_stdout(io.StringIO()):
+    spec.loader.exec_module(module)
+  return module
@@ -0,0 +1,96 @@
+# Benchmark the memory used per element by every container of the repository
+
+"""
+Each container is filled with n elements that were allocated before measuring, so
+the reported figure is the overhead of the container itself (nodes, positions, items
+and arrays) and not of the elements. Run from the repository root:
+
+    python benchmarks/memory_benchmark.py [n]
+
+"""
+
+import sys
+import tracemalloc
+
+from loader import load
+
+def fill_tree(tree, elements):
+  # Build a complete binary tree level by level
+  frontier = [tree.add_root(elements[0])]
+  k = 1
+  while k < len(elements):
+    next_level = []
+    for p in frontier:
+      for add in (tree.add_left, tree.add_right):
+        if k < len(elements):
+          next_level.append(add(p, elements[k]))
+          k += 1
+    frontier = next_level
+
+def containers():
+  # Return (name, factory, fill) triples for every container to measure
+  stack = load('stack/stack.py', 'array_stack')
+  linked_stack = load('stack/linked_stack.py', 'linked_stack')
+  array_queue = load('queue/queue.py', 'array_queue')
+  linked_queue = load('queue/linked_queue.py', 'linked_queue')
+  circular_queue = load('queue/circular_queue.py', 'circular_queue')
+  deque = load('deque_using_doubly_linked_list/deque.py', 'linked_deque')
+  positional_list = load('positional_list/positional_list.py', 'positional_list_module')
+  priority_queue = load('priority_queue/priority_queue.py', 'priority_queue_module')
+  tree = load('tree/tree.py', 'tree_module')
+  avl_tree = load('tree/avl_tree.py', 'avl_tree_module')
+
+  def each(method):
+    def fill(container, elements):
+      add = getattr(container, method)
+      for e in elements:
+        add(e)
+    return fill
+
+  def pairs(container, elements):
+    for e in elements:
+      container.add(e, e)
+
+  def items(container, elements):
+    for e in elements:
+      container[e] = e
+
+  return [
+    ('ArrayStack', stack.ArrayStack, each('push')),
+    ('LinkedStack', linked_stack.LinkedStack, each('push')),
+    ('ArrayQueue', array_queue.ArrayQueue, each('enqueue')),
+    ('LinkedQueue', linked_queue.LinkedQueue, each('enqueue')),
+    ('UnrolledLinkedQueue', linked_queue.UnrolledLinkedQueue, each('enqueue')),
+    ('CircularQueue', circular_queue.CircularQueue, each('enqueue')),
+    ('LinkedDeque', deque.LinkedDeque, each('add_last')),
+    ('UnrolledLinkedDeque', deque.UnrolledLinkedDeque, each('add_last')),
+    ('ArrayDeque', deque.ArrayDeque, each('add_last')),
+    ('PositionalList', positional_list.PositionalList, each('add_last')),
+    ('HeapPriorityQueue', priority_queue.HeapPriorityQueue, pairs),
+    ('CompactHeapPriorityQueue', priority_queue.CompactHeapPriorityQueue, pairs),
+    ('PairingHeapPriorityQueue', priority_queue.PairingHeapPriorityQueue, pairs),
+    ('IndexedSortedPriorityQueue', priority_queue.IndexedSortedPriorityQueue, pairs),
+    ('LinkedBinaryTree', tree.LinkedBinaryTree, fill_tree),
+    ('ArrayBinaryTree', tree.ArrayBinaryTree, each('add')),
+    ('AVLTreeMap', avl_tree.AVLTreeMap, items),
+  ]
+
+def measure(factory, fill, elements):
+  # Return the bytes allocated by the container per stored element
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  container = factory()
+  fill(container, elements)
+  after = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  del container
+  return (after - before) / len(elements)
+
+def benchmark_memory(n=100000):
+  elements = [float(k) for k in range(n)]
+  print(f"{'container':>26}  bytes per element (n={n})")
+  for name, factory, fill in containers():
+    print(f"{name:>26}  {measure(factory, fill, elements):8.1f}")
+
+if __name__ == '__main__':
+  benchmark_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
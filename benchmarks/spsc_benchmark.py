@@ -0,0 +1,73 @@
+# Benchmark the throughput of SPSCQueue against the standard library queue.Queue
+
+"""
+One producer thread pushes n integers through the queue to one consumer thread. The
+SPSC queue is polled without locks and the threads yield with sleep(0) when the queue
+is full or empty; queue.Queue uses its own lock and blocking put/get. Run from the
+repository root:
+
+    python benchmarks/spsc_benchmark.py [n]
+
+"""
+
+import queue
+import sys
+import threading
+import time
+
+from loader import load
+
+def run(produce, consume):
+  # Run producer and consumer threads and return the elapsed time in seconds
+  threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+  start = time.perf_counter()
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  return time.perf_counter() - start
+
+def spsc_throughput(n, capacity):
+  spsc = load('queue/spsc_queue.py', 'spsc_queue')
+  channel = spsc.SPSCQueue(capacity)
+  missing = object()
+
+  def produce():
+    offer = channel.offer
+    for k in range(n):
+      while not offer(k):
+        time.sleep(0)
+
+  def consume():
+    poll = channel.poll
+    received = 0
+    while received < n:
+      if poll(missing) is missing:
+        time.sleep(0)
+      else:
+        received += 1
+
+  return n / run(produce, consume)
+
+def stdlib_throughput(n, capacity):
+  channel = queue.Queue(capacity)
+
+  def produce():
+    put = channel.put
+    for k in range(n):
+      put(k)
+
+  def consume():
+    get = channel.get
+    for _ in range(n):
+      get()
+
+  return n / run(produce, consume)
+
+def benchmark_spsc(n=200000, capacity=1024):
+  print(f"{'queue':>12}  elements per second (n={n}, capacity={capacity})")
+  print(f"{'SPSCQueue':>12}  {spsc_throughput(n, capacity):12,.0f}")
+  print(f"{'queue.Queue':>12}  {stdlib_throughput(n, capacity):12,.0f}")
+
+if __name__ == '__main__':
+  benchmark_spsc(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -6,18 +6,25 @@ class Empty(Exception):
 class DoublyLinkedList:
   
   class Node: 
+    __slots__ = ('element', 'prev', 'next') # streamline memory usage
+
     def __init__(self, element, prev, next):
       self.element = element
       self.prev = prev
       self.next = next
 
-  def __init__(self):
-    # Create an empty queue 
+  def __init__(self, pool_size=0):
+    # Create an empty queue. Up to pool_size deleted nodes are kept on a free list and
+    # reused by later insertions instead of allocating new nodes
     self.header = self.Node(None, None, None)
     self.trailer = self.Node(None, None, None)
     self.header.next = self.trailer
     self.trailer.prev = self.header
     self._size = 0
+    self.pool_size = pool_size
+    self.pool = []
+    self.pool_hits = 0
+    self.pool_misses = 0
 
   def __len__(self):
     # Return the number of elements in the queue
@@ -29,7 +36,15 @@ class DoublyLinkedList:
   
   def insert_between(self, item, predecessor, successor): 
     # Add item between two existing nodes and return new node
-    newest = self.Node(item, predecessor, successor)
+    if self.pool:
+      newest = self.pool.pop()
+      newest.element = item
+      newest.prev = predecessor
+      newest.next = successor
+      self.pool_hits += 1
+    else:
+      newest = self.Node(item, predecessor, successor)
+      self.pool_misses += 1
     predecessor.next = newest
     successor.prev = newest
     self._size += 1
@@ -44,7 +59,19 @@ class DoublyLinkedList:
     self._size -= 1
     element = node.element # record deleted element
     node.prev = node.next = node.element = None #  deprecate node
+    if len(self.pool) < self.pool_size:
+      self.pool.append(node)
     return element 
+
+  def pool_stats(self):
+    # Return the number of pooled nodes and the hit rate of node allocations
+    requests = self.pool_hits + self.pool_misses
+    return {
+      'pooled': len(self.pool),
+      'hits': self.pool_hits,
+      'misses': self.pool_misses,
+      'hit_rate': self.pool_hits / requests if requests else 0.0,
+    }
   
 # Implementing a Deque with a Doubly Linked List
 
@@ -83,6 +110,255 @@ class LinkedDeque(DoublyLinkedList):
     return self.delete_node(self.trailer.prev)
   
 
+# Implementing a Deque with an Unrolled Doubly Linked List. Each node holds a fixed-size
+# block of elements, so a node is only allocated once per BLOCK_SIZE insertions at an end
+# and neighbouring elements sit next to each other in memory
+
+class UnrolledLinkedDeque:
+
+  BLOCK_SIZE = 64
+
+  class Block:
+    __slots__ = ('data', 'prev', 'next') # streamline memory usage
+
+    def __init__(self, size, prev=None, next=None):
+      self.data = [None] * size
+      self.prev = prev
+      self.next = next
+
+  def __init__(self):
+    # Create an empty deque whose single block is filled outwards from its centre
+    self.left = self.right = self.Block(self.BLOCK_SIZE)
+    self.recenter()
+    self._size = 0
+
+  def recenter(self):
+    # Place the empty deque in the middle of its right block so both ends have room
+    self.left = self.right
+    self.left.prev = self.left.next = None
+    self.left_index = self.BLOCK_SIZE // 2
+    self.right_index = self.left_index - 1
+
+  def __len__(self):
+    # Return the number of elements in the deque
+    return self._size
+
+  def is_empty(self):
+    # Return True if the deque is empty, False otherwise
+    return self._size == 0
+
+  def first(self):
+    # Return the element at the front of the deque without removing it
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    return self.left.data[self.left_index]
+
+  def last(self):
+    # Return the element at the end of the deque without removing it
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    return self.right.data[self.right_index]
+
+  def add_first(self, item):
+    # Add item to the front of the deque, opening a new block if the first one is full
+    if self.left_index == 0:
+      block = self.Block(self.BLOCK_SIZE, None, self.left)
+      self.left.prev = block
+      self.left = block
+      self.left_index = self.BLOCK_SIZE
+    self.left_index -= 1
+    self.left.data[self.left_index] = item
+    self._size += 1
+
+  def add_last(self, item):
+    # Add item to the end of the deque, opening a new block if the last one is full
+    if self.right_index == self.BLOCK_SIZE - 1:
+      block = self.Block(self.BLOCK_SIZE, self.right, None)
+      self.right.next = block
+      self.right = block
+      self.right_index = -1
+    self.right_index += 1
+    self.right.data[self.right_index] = item
+    self._size += 1
+
+  def delete_first(self):
+    # Remove and return the element at the front of the deque
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    item = self.left.data[self.left_index]
+    self.left.data[self.left_index] = None
+    self.left_index += 1
+    self._size -= 1
+    if self._size == 0:
+      self.recenter()
+    elif self.left_index == self.BLOCK_SIZE:
+      self.left = self.left.next
+      self.left.prev = None
+      self.left_index = 0
+    return item
+
+  def delete_last(self):
+    # Remove and return the element at the end of the deque
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    item = self.right.data[self.right_index]
+    self.right.data[self.right_index] = None
+    self.right_index -= 1
+    self._size -= 1
+    if self._size == 0:
+      self.recenter()
+    elif self.right_index == -1:
+      self.right = self.right.prev
+      self.right.next = None
+      self.right_index = self.BLOCK_SIZE - 1
+    return item
+
+
+# Implementing a Deque with a Circular Array. Elements sit in one list used as a ring, so
+# any index is reached in O(1) and both ends are amortized O(1)
+
+class ArrayDeque:
+
+  DEFAULT_CAPACITY = 16
+
+  def __init__(self, iterable=()):
+    # Create a deque holding the elements of iterable
+    self._data = [None]*ArrayDeque.DEFAULT_CAPACITY
+    self._front = 0
+    self._size = 0
+    self.extend(iterable)
+
+  def __len__(self):
+    # Return the number of elements in the deque
+    return self._size
+
+  def is_empty(self):
+    # Return True if the deque is empty, False otherwise
+    return self._size == 0
+
+  def resize(self, new_capacity):
+    # Move the elements to a new ring of new_capacity slots with at most two slice copies
+    old = self._data
+    end = self._front + self._size
+    if end <= len(old):
+      elements = old[self._front:end]
+    else:
+      elements = old[self._front:] + old[:end - len(old)]
+    self._data = elements + [None]*(new_capacity - self._size)
+    self._front = 0
+
+  def reserve(self, count):
+    # Make room for count more elements
+    if self._size + count > len(self._data):
+      self.resize(max(self._size + count, 2*len(self._data)))
+
+  def index(self, i):
+    # Return the ring slot of element i, accepting negative indices as lists do
+    if i < 0:
+      i += self._size
+    if not 0 <= i < self._size:
+      raise IndexError('deque index out of range')
+    return (self._front + i) % len(self._data)
+
+  def __getitem__(self, i):
+    # Return the element at index i in O(1) time
+    return self._data[self.index(i)]
+
+  def __setitem__(self, i, item):
+    # Replace the element at index i in O(1) time
+    self._data[self.index(i)] = item
+
+  def __iter__(self):
+    # Generate the elements from first to last
+    for k in range(self._size):
+      yield self._data[(self._front + k) % len(self._data)]
+
+  def first(self):
+    # Return the element at the front of the deque without removing it
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    return self._data[self._front]
+
+  def last(self):
+    # Return the element at the end of the deque without removing it
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    return self._data[(self._front + self._size - 1) % len(self._data)]
+
+  def add_first(self, item):
+    # Add item to the front of the deque
+    self.reserve(1)
+    self._front = (self._front - 1) % len(self._data)
+    self._data[self._front] = item
+    self._size += 1
+
+  def add_last(self, item):
+    # Add item to the end of the deque
+    self.reserve(1)
+    self._data[(self._front + self._size) % len(self._data)] = item
+    self._size += 1
+
+  def delete_first(self):
+    # Remove and return the element at the front of the deque
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    item = self._data[self._front]
+    self._data[self._front] = None
+    self._front = (self._front + 1) % len(self._data)
+    self._size -= 1
+    return item
+
+  def delete_last(self):
+    # Remove and return the element at the end of the deque
+    if self.is_empty():
+      raise Empty('Deque is empty')
+    back = (self._front + self._size - 1) % len(self._data)
+    item = self._data[back]
+    self._data[back] = None
+    self._size -= 1
+    return item
+
+  def write(self, start, items):
+    # Copy items into the ring from slot start onwards, with at most two slice copies
+    capacity = len(self._data)
+    head = min(len(items), capacity - start)
+    self._data[start:start + head] = items[:head]
+    self._data[:len(items) - head] = items[head:]
+
+  def extend(self, iterable):
+    # Add every element of iterable to the end of the deque
+    items = list(iterable)
+    self.reserve(len(items))
+    self.write((self._front + self._size) % len(self._data), items)
+    self._size += len(items)
+
+  def extendleft(self, iterable):
+    # Add every element of iterable to the front of the deque in turn, so they end up reversed
+    items = list(iterable)
+    self.reserve(len(items))
+    self._front = (self._front - len(items)) % len(self._data)
+    self.write(self._front, items[::-1])
+    self._size += len(items)
+
+  def rotate(self, k=1):
+    # Rotate the deque k steps to the right (to the left if k is negative). A full ring only
+    # moves its front index; otherwise min(k, n - k) elements move from one end to the other
+    n = self._size
+    if n <= 1:
+      return
+    k %= n
+    if k == 0:
+      return
+    capacity = len(self._data)
+    if n == capacity:
+      self._front = (self._front - k) % capacity
+    elif k <= n - k:
+      for _ in range(k):
+        self.add_first(self.delete_last())
+    else:
+      for _ in range(n - k):
+        self.add_last(self.delete_first())
+
 
 # Create an instance of LinkedDeque
 deque = LinkedDeque()
@@ -114,3 +390,26 @@ print("Removed last element:", deque.delete_last())    # Should print 20
 
 # Test if the deque is empty
 print("Is deque empty?", deque.is_empty())  # Should print True
+
+# Test reusing nodes with a pooled deque
+pooled = LinkedDeque(pool_size=4)
+for k in range(1000):
+  pooled.add_last(k)
+  pooled.delete_first()
+print("Pool stats:", pooled.pool_stats())  # Should report 999 hits and 1 miss
+
+# Test the unrolled deque across block boundaries
+unrolled = UnrolledLinkedDeque()
+for k in range(200):
+  unrolled.add_last(k)
+  unrolled.add_first(-k)
+print("First and last of unrolled deque:", unrolled.first(), unrolled.last())  # Should print -199 199
+print("Removed from both ends:", unrolled.delete_first(), unrolled.delete_last())  # Should print -199 199
+print("Unrolled deque length:", len(unrolled))  # Should print 398
+
+# Test indexing and rotation of the array deque
+window = ArrayDeque(range(5))
+window.rotate(2)
+print("Rotated deque:", list(window))  # Should print [3, 4, 0, 1, 2]
+window.extendleft([10, 11])
+print("Indexed access:", window[0], window[-1], window[3])  # Should print 11 2 4
@@ -8,18 +8,26 @@ perform arbitrary insertions and deletions
 class DoublyLinkedList:
   
   class Node: 
+    __slots__ = ('element', 'prev', 'next', 'generation') # streamline memory usage
+
     def __init__(self, element, prev, next):
       self.element = element
       self.prev = prev
       self.next = next
+      self.generation = 0 # bumped every time the node is recycled
 
-  def __init__(self):
-    # Create an empty queue 
+  def __init__(self, pool_size=0):
+    # Create an empty queue. Up to pool_size deleted nodes are kept on a free list and
+    # reused by later insertions instead of allocating new nodes
     self.header = self.Node(None, None, None)
     self.trailer = self.Node(None, None, None)
     self.header.next = self.trailer
     self.trailer.prev = self.header
     self._size = 0
+    self.pool_size = pool_size
+    self.pool = []
+    self.pool_hits = 0
+    self.pool_misses = 0
 
   def __len__(self):
     # Return the number of elements in the queue
@@ -31,7 +39,15 @@ class DoublyLinkedList:
   
   def insert_between(self, item, predecessor, successor): 
     # Add item between two existing nodes and return new node
-    newest = self.Node(item, predecessor, successor)
+    if self.pool:
+      newest = self.pool.pop()
+      newest.element = item
+      newest.prev = predecessor
+      newest.next = successor
+      self.pool_hits += 1
+    else:
+      newest = self.Node(item, predecessor, successor)
+      self.pool_misses += 1
     predecessor.next = newest
     successor.prev = newest
     self._size += 1
@@ -46,8 +62,21 @@ class DoublyLinkedList:
     self._size -= 1
     element = node.element # record deleted element
     node.prev = node.next = node.element = None #  deprecate node
+    if len(self.pool) < self.pool_size:
+      node.generation += 1 # positions of the deleted element must not match the reused node
+      self.pool.append(node)
     return element 
 
+  def pool_stats(self):
+    # Return the number of pooled nodes and the hit rate of node allocations
+    requests = self.pool_hits + self.pool_misses
+    return {
+      'pooled': len(self.pool),
+      'hits': self.pool_hits,
+      'misses': self.pool_misses,
+      'hit_rate': self.pool_hits / requests if requests else 0.0,
+    }
+
 # ---------------------------------------------------------------------------
 
 """
@@ -73,10 +102,12 @@ class PositionalList(DoublyLinkedList):
 
   class Position:
     # Represent the location of single element
+    __slots__ = ('container', 'node', 'generation')
 
     def __init__(self, container, node):
       self.container = container
       self.node = node
+      self.generation = node.generation
 
     def element(self):
       # Return the element stored at this position
@@ -96,7 +127,7 @@ class PositionalList(DoublyLinkedList):
       raise TypeError('p must be a Position instance')
     if p.container is not self:
       raise ValueError('p does not belong to this container')
-    if p.node.next is None:
+    if p.node.next is None or p.generation != p.node.generation:
       raise ValueError('p is no longer valid')
     return p.node
   
@@ -127,10 +158,31 @@ class PositionalList(DoublyLinkedList):
   
   def iter(self, p):
     # Generate an iterator for the elements in the list starting at position p
-    cursor = self.first()
-    while cursor is not None:
-      yield cursor.element()
-      cursor = self.after(cursor)
+    node = self.validate(p)
+    while node is not self.trailer:
+      yield node.element
+      node = node.next
+
+  def __iter__(self):
+    # Generate the elements from first to last, walking the nodes directly
+    node = self.header.next
+    while node is not self.trailer:
+      yield node.element
+      node = node.next
+
+  def __reversed__(self):
+    # Generate the elements from last to first, walking the nodes directly
+    node = self.trailer.prev
+    while node is not self.header:
+      yield node.element
+      node = node.prev
+
+  def positions(self):
+    # Generate the positions from first to last, creating each Position only when requested
+    node = self.header.next
+    while node is not self.trailer:
+      yield self.Position(self, node)
+      node = node.next
 
 # ------------------- Overridden Methods ------------------------------------------
   
@@ -216,8 +268,54 @@ def test_positional_list():
     elements = [element for element in pl.iter(pl.first())]
     assert elements == [12, 15, 20]
 
+    # Test node-level iteration
+    assert list(pl) == [12, 15, 20]
+    assert list(reversed(pl)) == [20, 15, 12]
+    assert [p.element() for p in pl.positions()] == [12, 15, 20]
+    assert list(pl.iter(pl.after(pl.first()))) == [15, 20]
+
+    # Test node pooling and invalidation of positions of recycled nodes
+    pooled = PositionalList(pool_size=1)
+    stale = pooled.add_last(1)
+    pooled.delete(stale)
+    fresh = pooled.add_last(2)
+    assert fresh.node is stale.node
+    try:
+      pooled.delete(stale)
+      assert False
+    except ValueError:
+      pass
+    assert pooled.pool_stats()['hits'] == 1
+
     print("All tests passed!")
 
 # Run the test function
 test_positional_list()
 
+# ------------------------------------------------------------------------------------------------
+
+# Benchmark the cost per element of walking the list through positions and through nodes
+
+def benchmark_positional_list(n=100000, repeat=5):
+    import timeit
+    pl = PositionalList()
+    for k in range(n):
+      pl.add_last(k)
+
+    def walk_positions():
+      cursor = pl.first()
+      while cursor is not None:
+        cursor.element()
+        cursor = pl.after(cursor)
+
+    def walk_nodes():
+      for _ in pl:
+        pass
+
+    for name, walk in (('first/after', walk_positions), ('__iter__', walk_nodes)):
+      best = min(timeit.repeat(walk, number=1, repeat=repeat))
+      print(f"{name:>12}: {best / n * 1e9:8.1f} ns per element")
+
+if __name__ == '__main__':
+    benchmark_positional_list()
+
@@ -0,0 +1,213 @@
+# Priority queues that can be shared between threads or asyncio tasks
+
+"""
+A thread-safe wrapper and an asyncio wrapper around HeapPriorityQueue. Every operation
+on the underlying heap runs while holding a single lock, and consumers can wait for the
+next element instead of polling. When a maximum size is given, producers wait for free
+space (backpressure) instead of letting the queue grow without bound.
+
+"""
+
+import asyncio
+import threading
+import time
+
+from priority_queue.priority_queue import Empty, HeapPriorityQueue
+
+class Full(Exception): # Raised when adding to a bounded queue that has no free space
+  pass
+
+class BlockingPriorityQueue:
+
+  def __init__(self, maxsize=0, engine=HeapPriorityQueue):
+    # Create an empty queue; maxsize <= 0 means the queue is unbounded
+    self.data = engine()
+    self.maxsize = maxsize
+    self.lock = threading.Lock()
+    self.not_empty = threading.Condition(self.lock)
+    self.not_full = threading.Condition(self.lock)
+
+  def __len__(self):
+    with self.lock:
+      return len(self.data)
+
+  def is_empty(self):
+    return len(self) == 0
+
+  def is_full(self):
+    with self.lock:
+      return 0 < self.maxsize <= len(self.data)
+
+  def wait_for(self, condition, ready, timeout):
+    # Wait on condition until ready() is true, return False if timeout expired first
+    if timeout is None:
+      while not ready():
+        condition.wait()
+      return True
+    if timeout < 0:
+      raise ValueError('timeout must be a non-negative number')
+    deadline = time.monotonic() + timeout
+    while not ready():
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        return False
+      condition.wait(remaining)
+    return True
+
+  def put(self, key, value, block=True, timeout=None):
+    # Add a key-value pair. When the queue is full wait for free space, for at most
+    # timeout seconds, and raise Full if there is still none or block is False
+    with self.not_full:
+      if self.maxsize > 0:
+        has_space = lambda: len(self.data) < self.maxsize
+        if not block:
+          if not has_space():
+            raise Full('Priority queue is full')
+        elif not self.wait_for(self.not_full, has_space, timeout):
+          raise Full('Priority queue is full')
+      self.data.add(key, value)
+      self.not_empty.notify()
+
+  def put_nowait(self, key, value):
+    # Add a key-value pair without blocking, raise Full if there is no free space
+    self.put(key, value, block=False)
+
+  def get(self, block=True, timeout=None):
+    # Remove and return the key-value pair with minimum key. When the queue is empty
+    # wait for an element, for at most timeout seconds, and raise Empty if none arrives
+    with self.not_empty:
+      has_item = lambda: len(self.data) > 0
+      if not block:
+        if not has_item():
+          raise Empty('Priority queue is empty')
+      elif not self.wait_for(self.not_empty, has_item, timeout):
+        raise Empty('Priority queue is empty')
+      answer = self.data.remove_min()
+      self.not_full.notify()
+      return answer
+
+  def get_nowait(self):
+    # Remove and return the key-value pair with minimum key without blocking
+    return self.get(block=False)
+
+  def min(self):
+    # Return the key-value pair with minimum key without removing it
+    with self.lock:
+      return self.data.min()
+
+
+class AsyncPriorityQueue:
+
+  def __init__(self, maxsize=0, engine=HeapPriorityQueue):
+    # Create an empty queue; maxsize <= 0 means the queue is unbounded. The queue must
+    # only be used from tasks running on a single event loop
+    self.data = engine()
+    self.maxsize = maxsize
+    self.changed = asyncio.Condition()
+
+  def __len__(self):
+    return len(self.data)
+
+  def is_empty(self):
+    return len(self.data) == 0
+
+  def is_full(self):
+    return 0 < self.maxsize <= len(self.data)
+
+  async def put(self, key, value):
+    # Add a key-value pair, waiting for free space while the queue is full
+    async with self.changed:
+      await self.changed.wait_for(lambda: not self.is_full())
+      self.data.add(key, value)
+      self.changed.notify_all()
+
+  def put_nowait(self, key, value):
+    # Add a key-value pair without waiting, raise Full if there is no free space
+    if self.is_full():
+      raise Full('Priority queue is full')
+    self.data.add(key, value)
+    self.wake()
+
+  async def get(self):
+    # Remove and return the key-value pair with minimum key, waiting for an element
+    # while the queue is empty
+    async with self.changed:
+      await self.changed.wait_for(lambda: not self.is_empty())
+      answer = self.data.remove_min()
+      self.changed.notify_all()
+      return answer
+
+  def get_nowait(self):
+    # Remove and return the key-value pair with minimum key without waiting
+    answer = self.data.remove_min()
+    self.wake()
+    return answer
+
+  def min(self):
+    # Return the key-value pair with minimum key without removing it
+    return self.data.min()
+
+  def wake(self):
+    # Wake waiting tasks after a change made outside of the condition's lock
+    async def notify():
+      async with self.changed:
+        self.changed.notify_all()
+    try:
+      asyncio.get_running_loop().create_task(notify())
+    except RuntimeError:
+      pass # No running loop, so no task can be waiting
+
+
+# Test the implementation of the concurrent priority queues
+
+def test_concurrent_priority_queue():
+    queue = BlockingPriorityQueue(maxsize=2)
+
+    # Test that a consumer thread receives elements in key order
+    received = []
+    def consume():
+      for _ in range(3):
+        received.append(queue.get(timeout=5))
+    consumer = threading.Thread(target=consume)
+    queue.put(2, 'b')
+    queue.put(1, 'a')
+    consumer.start()
+    queue.put(3, 'c', timeout=5)
+    consumer.join()
+    assert [key for key, _ in received][:2] == [1, 2]
+    assert sorted(received) == [(1, 'a'), (2, 'b'), (3, 'c')]
+
+    # Test backpressure and timeouts
+    queue.put_nowait(5, 'e')
+    queue.put_nowait(4, 'd')
+    try:
+      queue.put(6, 'f', timeout=0.01)
+      assert False
+    except Full:
+      pass
+    assert queue.get_nowait() == (4, 'd')
+    assert queue.get() == (5, 'e')
+    try:
+      queue.get(timeout=0.01)
+      assert False
+    except Empty:
+      pass
+
+    # Test the asyncio queue with a bounded producer and a consumer task
+    async def run():
+      aqueue = AsyncPriorityQueue(maxsize=1)
+      async def produce():
+        for key in (3, 1, 2):
+          await aqueue.put(key, str(key))
+      producer = asyncio.ensure_future(produce())
+      keys = [(await aqueue.get())[0] for _ in range(3)]
+      await producer
+      return keys
+    assert asyncio.run(run()) == [3, 1, 2]
+
+    print("All tests passed!")
+
+# Run the test only as a script: it starts threads and an event loop, which must not happen
+# when the module is imported, least of all from inside a running loop
+if __name__ == '__main__':
+    test_concurrent_priority_queue()
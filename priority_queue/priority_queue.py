@@ -15,6 +15,7 @@ class Empty(Exception): # Subclass Empty that inherits the properties from pytho
 class PriorityQueue():
 
   class item:
+    __slots__ = ('key', 'value') # streamline memory usage
 
     def __init__(self, key, value):
       self.key = key
@@ -25,9 +26,23 @@ class PriorityQueue():
     
   def is_empty(self):
     return len(self) == 0
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable
+    for key, value in pairs:
+      self.add(key, value)
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    answer = []
+    for _ in range(min(k, len(self))):
+      answer.append(self.remove_min())
+    return answer
   
 # Implementing a Priority Queue with an Unsorted List
 
+import heapq
+
 from positional_list.positional_list import PositionalList
 
 class UnsortedPriorityQueue(PriorityQueue):
@@ -36,13 +51,14 @@ class UnsortedPriorityQueue(PriorityQueue):
     # Return Position of item with minimum key
     if self.is_empty():
       raise Empty('Priority queue is empty') 
-    small = self.data.first()
-    walk = self.data.after(small)
-    while walk is not None:
+    small = self.data.header.next
+    walk = small.next
+    trailer = self.data.trailer
+    while walk is not trailer:
       if walk.element < small.element:
         small = walk
-        walk = self.data.after(walk)
-    return small
+      walk = walk.next
+    return self.data.make_position(small)
   
   def __init__(self):
     self.data = PositionalList()
@@ -65,8 +81,77 @@ class UnsortedPriorityQueue(PriorityQueue):
     p = self.find_min()
     items = self.data.delete(p)
     return (items.key, items.value)
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable at the end of the list
+    add_last = self.data.add_last
+    item = self.item
+    for key, value in pairs:
+      add_last(item(key, value))
+
+  def smallest_nodes(self, k):
+    # Return the nodes holding the k smallest keys, in order, in one O(n log k) pass
+    nodes = []
+    walk = self.data.header.next
+    while walk is not self.data.trailer:
+      nodes.append(walk)
+      walk = walk.next
+    return heapq.nsmallest(k, nodes, key=lambda node: node.element.key)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing them
+    return [(node.element.key, node.element.value) for node in self.smallest_nodes(k)]
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    answer = []
+    for node in self.smallest_nodes(k):
+      items = self.data.delete_node(node)
+      answer.append((items.key, items.value))
+    return answer
   
 
+# Unsorted list priority queue that caches the position of its minimum. add compares the
+# new item with the cached minimum, so min() is O(1) while items are only added; the
+# linear scan is deferred until the minimum is requested after a removal
+
+class CachedUnsortedPriorityQueue(UnsortedPriorityQueue):
+
+  def __init__(self):
+    super().__init__()
+    self.small = None # Position of the minimum, or None when it must be rescanned
+
+  def find_min(self):
+    # Return Position of item with minimum key, rescanning only if the cache is stale
+    if self.small is None:
+      self.small = super().find_min()
+    return self.small
+
+  def add(self, key, value):
+    # Add a key-value pair and keep the cached minimum up to date
+    was_empty = self.is_empty()
+    p = self.data.add_last(self.item(key, value))
+    if was_empty or (self.small is not None and p.element() < self.small.element()):
+      self.small = p
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable, invalidating the cached minimum
+    super().add_many(pairs)
+    self.small = None
+
+  def remove_min(self):
+    # Remove and return key-value pair with minimum key
+    answer = super().remove_min()
+    self.small = None
+    return answer
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    answer = super().pop_n(k)
+    self.small = None
+    return answer
+
+
 # Implementation with a Sorted List
 
 class SortedPriorityQueue(PriorityQueue):
@@ -79,13 +164,11 @@ class SortedPriorityQueue(PriorityQueue):
   
   def add(self, key, value):
     new = self.item(key, value)
-    walk = self.data.last()
-    while walk is not None and new < walk.element():
-      walk = self.data.before(walk)
-    if walk is None:
-      self.data.add_first(new)
-    else:
-      self.data.add_after(walk, new)
+    walk = self.data.trailer.prev
+    header = self.data.header
+    while walk is not header and new < walk.element:
+      walk = walk.prev
+    self.data.insert_between(new, walk, walk.next)
 
   def min(self):
     if self.is_empty():
@@ -100,51 +183,92 @@ class SortedPriorityQueue(PriorityQueue):
     p = self.data.first()
     items = self.data.delete(p)
     return (items.key, items.value)
+
+  def add_many(self, pairs):
+    # Sort the batch, then merge it into the list in a single forward pass
+    batch = sorted((self.item(key, value) for key, value in pairs), key=lambda new: new.key)
+    walk = self.data.header.next
+    trailer = self.data.trailer
+    for new in batch:
+      while walk is not trailer and not new < walk.element:
+        walk = walk.next
+      self.data.insert_between(new, walk.prev, walk)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing them
+    answer = []
+    walk = self.data.header.next
+    trailer = self.data.trailer
+    while walk is not trailer and len(answer) < k:
+      answer.append((walk.element.key, walk.element.value))
+      walk = walk.next
+    return answer
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    answer = []
+    header = self.data.header
+    for _ in range(min(k, len(self.data))):
+      items = self.data.delete_node(header.next)
+      answer.append((items.key, items.value))
+    return answer
   
 
 # A min-oriented priority queue implemented with a binary heap
 
-class HeapPriorityQueue(PriorityQueue):
+def heapify_is_cheaper(count, total):
+  # Return True if rebuilding a heap of total entries bottom-up costs less than sifting
+  # its last count entries up one by one
+  return count * total.bit_length() > total
 
-  def parent(self, j):
-    return (j - 1) // 2
-  
-  def left(self, j):
-    return 2 * j + 1
-  
-  def right(self, j):
-    return 2 * j + 2
-  
-  def has_left(self, j):
-    return self.left(j) < len(self)
-  
-  def has_right(self, j):
-    return self.right(j) < len(self)
-  
-  def swap(self, i, j):
-    self._data[i], self._data[j] = self._data[j], self._data[i]
+class HeapPriorityQueue(PriorityQueue):
 
   def upheap(self, j):
-    parent = self.parent(j)
-    if j > 0 and self._data[j] < self._data[parent]:
-      self.swap(j, parent)
-      self.upheap(parent)
+    # Move the entry at index j up, shifting larger parents down into the hole
+    data = self.data
+    entry = data[j]
+    while j > 0:
+      parent = (j - 1) >> 1
+      above = data[parent]
+      if not entry < above:
+        break
+      data[j] = above
+      j = parent
+    data[j] = entry
 
   def downheap(self, j):
-    if self.has_left(j):
-      left = self.left(j)
-      smallest = left
-      if self.has_right(j):
-        right = self.right(j)
-        if self.data[right] < self.data[left]:
-          smallest = right
-      if self.data[smallest] < self.data[j]:
-        self.swap(j, smallest)
-        self.downheap(smallest)
+    # Move the entry at index j down, shifting smaller children up into the hole
+    data = self.data
+    n = len(data)
+    entry = data[j]
+    child = 2 * j + 1
+    while child < n:
+      right = child + 1
+      if right < n and data[right] < data[child]:
+        child = right
+      if not data[child] < entry:
+        break
+      data[j] = data[child]
+      j = child
+      child = 2 * j + 1
+    data[j] = entry
+
+  def heapify(self):
+    # Arrange the array into a heap bottom-up in O(n) time
+    for j in range(len(self.data) // 2 - 1, -1, -1):
+      self.downheap(j)
 
   def __init__(self):
     self.data = []
 
+  @classmethod
+  def from_pairs(cls, pairs):
+    # Build a priority queue from an iterable of key-value pairs in O(n) time
+    queue = cls()
+    queue.data = [cls.item(key, value) for key, value in pairs]
+    queue.heapify()
+    return queue
+
   def __len__(self):
     return len(self.data)
   
@@ -153,13 +277,909 @@ class HeapPriorityQueue(PriorityQueue):
     self.upheap(len(self.data) - 1)
 
   def min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
     item = self.data[0]
     return (item.key, item.value)
   
   def remove_min(self):
     if self.is_empty():
       raise Empty('Priority queue is empty')
-    self.swap(0, len(self.data) - 1)
-    item = self.data.pop()
+    last = self.data.pop()
+    if not self.data:
+      return (last.key, last.value)
+    item = self.data[0]
+    self.data[0] = last
     self.downheap(0)
     return (item.key, item.value)
+
+  def pushpop(self, key, value):
+    # Add a key-value pair, then remove and return the pair with minimum key
+    new = self.item(key, value)
+    if not self.data or not self.data[0] < new:
+      return (key, value)
+    item = self.data[0]
+    self.data[0] = new
+    self.downheap(0)
+    return (item.key, item.value)
+
+  def replace(self, key, value):
+    # Remove and return the pair with minimum key, then add a key-value pair
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    item = self.data[0]
+    self.data[0] = self.item(key, value)
+    self.downheap(0)
+    return (item.key, item.value)
+
+  def restore(self, start):
+    # Restore the heap after entries were appended from index start onwards. When
+    # the batch is large enough that sifting each entry up would cost more than
+    # rebuilding, heapify the whole array instead
+    total = len(self.data)
+    if heapify_is_cheaper(total - start, total):
+      self.heapify()
+    else:
+      for j in range(start, total):
+        self.upheap(j)
+
+  def meld(self, other):
+    # Move every entry of other into this priority queue, leaving other empty
+    if type(self) is not type(other):
+      raise TypeError('Priority queues must be of the same type')
+    start = len(self.data)
+    self.data.extend(other.data)
+    other.data = []
+    self.restore(start)
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable
+    start = len(self.data)
+    item = self.item
+    self.data.extend(item(key, value) for key, value in pairs)
+    self.restore(start)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing
+    # them. Only the frontier of the heap below already reported entries is explored
+    data = self.data
+    n = len(data)
+    answer = []
+    if n == 0 or k <= 0:
+      return answer
+    frontier = HeapPriorityQueue()
+    frontier.add(data[0].key, 0)
+    while frontier and len(answer) < k:
+      key, j = frontier.remove_min()
+      answer.append((key, data[j].value))
+      child = 2 * j + 1
+      if child < n:
+        frontier.add(data[child].key, child)
+      if child + 1 < n:
+        frontier.add(data[child + 1].key, child + 1)
+    return answer
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    data = self.data
+    if k >= len(data):
+      data.sort(key=lambda item: item.key)
+      answer = [(item.key, item.value) for item in data]
+      data.clear()
+      return answer
+    answer = []
+    for _ in range(k):
+      last = data.pop()
+      item = data[0]
+      data[0] = last
+      self.downheap(0)
+      answer.append((item.key, item.value))
+    return answer
+
+
+# An adaptable priority queue implemented with a binary heap. Every entry records its
+# own index in the array, so a locator returned by add can later be used to update or
+# remove that entry in O(log n) time without searching the heap
+
+class AdaptableHeapPriorityQueue(HeapPriorityQueue):
+
+  class Locator(HeapPriorityQueue.item):
+    # Token that identifies an entry of the priority queue
+    __slots__ = ('index',)
+
+    def __init__(self, key, value, index):
+      super().__init__(key, value)
+      self.index = index
+
+  def upheap(self, j):
+    # Move the entry at index j up, recording the new index of every moved entry
+    data = self.data
+    entry = data[j]
+    while j > 0:
+      parent = (j - 1) >> 1
+      above = data[parent]
+      if not entry < above:
+        break
+      data[j] = above
+      above.index = j
+      j = parent
+    data[j] = entry
+    entry.index = j
+
+  def downheap(self, j):
+    # Move the entry at index j down, recording the new index of every moved entry
+    data = self.data
+    n = len(data)
+    entry = data[j]
+    child = 2 * j + 1
+    while child < n:
+      right = child + 1
+      if right < n and data[right] < data[child]:
+        child = right
+      below = data[child]
+      if not below < entry:
+        break
+      data[j] = below
+      below.index = j
+      j = child
+      child = 2 * j + 1
+    data[j] = entry
+    entry.index = j
+
+  @classmethod
+  def from_pairs(cls, pairs):
+    # Build an adaptable priority queue from key-value pairs in O(n) time
+    queue = cls()
+    queue.data = [cls.Locator(key, value, j) for j, (key, value) in enumerate(pairs)]
+    queue.heapify()
+    return queue
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable and return the list of their locators
+    start = len(self.data)
+    tokens = [self.Locator(key, value, j) for j, (key, value) in enumerate(pairs, start)]
+    self.data.extend(tokens)
+    self.restore(start)
+    return tokens
+
+  def meld(self, other):
+    # Move every entry of other into this queue; locators of other stay valid here
+    if type(self) is not type(other):
+      raise TypeError('Priority queues must be of the same type')
+    start = len(self.data)
+    for j, token in enumerate(other.data, start):
+      token.index = j
+    self.data.extend(other.data)
+    other.data = []
+    self.restore(start)
+
+  def bubble(self, j):
+    # Restore the heap property for the entry at index j after its key changed
+    if j > 0 and self.data[j] < self.data[(j - 1) >> 1]:
+      self.upheap(j)
+    else:
+      self.downheap(j)
+
+  def validate(self, loc):
+    # Return the index of the locator, raise error if it is not part of this queue
+    if not isinstance(loc, self.Locator):
+      raise TypeError('loc must be a Locator instance')
+    j = loc.index
+    if not (0 <= j < len(self.data) and self.data[j] is loc):
+      raise ValueError('invalid locator')
+    return j
+
+  def add(self, key, value):
+    # Add a key-value pair and return a locator for the new entry
+    token = self.Locator(key, value, len(self.data))
+    self.data.append(token)
+    self.upheap(len(self.data) - 1)
+    return token
+
+  def update(self, loc, newkey, newval):
+    # Update the key and value of the entry identified by locator loc
+    j = self.validate(loc)
+    loc.key = newkey
+    loc.value = newval
+    self.bubble(j)
+
+  def remove(self, loc):
+    # Remove and return the key-value pair identified by locator loc
+    j = self.validate(loc)
+    last = self.data.pop()
+    if j < len(self.data):
+      self.data[j] = last
+      self.bubble(j)
+    return (loc.key, loc.value)
+
+  def pushpop_locator(self, key, value):
+    # Add a key-value pair, then remove the pair with minimum key. Return that pair and
+    # the locator of the new entry, or None if the new pair itself was the one removed
+    new = self.Locator(key, value, 0)
+    if not self.data or not self.data[0] < new:
+      return (key, value), None
+    item = self.data[0]
+    self.data[0] = new
+    self.downheap(0)
+    return (item.key, item.value), new
+
+  def replace_locator(self, key, value):
+    # Remove the pair with minimum key, then add a key-value pair. Return the removed
+    # pair and the locator of the new entry
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    item = self.data[0]
+    new = self.Locator(key, value, 0)
+    self.data[0] = new
+    self.downheap(0)
+    return (item.key, item.value), new
+
+  def pushpop(self, key, value):
+    # Add a key-value pair, then remove and return the pair with minimum key
+    return self.pushpop_locator(key, value)[0]
+
+  def replace(self, key, value):
+    # Remove and return the pair with minimum key, then add a key-value pair
+    return self.replace_locator(key, value)[0]
+
+
+
+# A sorted priority queue over a list of sorted blocks. Binary search on the largest key
+# of every block and then inside one block finds the insertion point in O(log n), and
+# inserting only shifts the entries of that block. The minimum is always the first entry
+# of the first block. Entries with equal keys are kept in insertion order
+
+from bisect import bisect_left, bisect_right
+
+class IndexedSortedPriorityQueue(PriorityQueue):
+
+  DEFAULT_LOAD = 500
+
+  def __init__(self, load=DEFAULT_LOAD):
+    # Create an empty queue whose blocks are split once they hold more than 2*load entries
+    if load < 1:
+      raise ValueError('load must be positive')
+    self.load = load
+    self.keys = [] # sorted keys of every block
+    self.values = [] # values of every block, parallel to keys
+    self.maxes = [] # largest key of every block
+    self.size = 0
+
+  def __len__(self):
+    return self.size
+
+  def add(self, key, value):
+    keys = self.keys
+    maxes = self.maxes
+    if not maxes:
+      keys.append([key])
+      self.values.append([value])
+      maxes.append(key)
+    else:
+      i = bisect_right(maxes, key)
+      if i == len(maxes):
+        i -= 1
+        keys[i].append(key)
+        self.values[i].append(value)
+        maxes[i] = key
+      else:
+        j = bisect_right(keys[i], key)
+        keys[i].insert(j, key)
+        self.values[i].insert(j, value)
+      if len(keys[i]) > 2 * self.load:
+        self.split(i)
+    self.size += 1
+
+  def split(self, i):
+    # Split block i into two halves
+    half = len(self.keys[i]) // 2
+    self.keys.insert(i + 1, self.keys[i][half:])
+    self.values.insert(i + 1, self.values[i][half:])
+    del self.keys[i][half:]
+    del self.values[i][half:]
+    self.maxes.insert(i, self.keys[i][-1])
+
+  def rebuild(self, keys, values):
+    # Replace the contents with sorted parallel lists of keys and values
+    load = self.load
+    self.keys = [keys[j:j + load] for j in range(0, len(keys), load)]
+    self.values = [values[j:j + load] for j in range(0, len(values), load)]
+    self.maxes = [block[-1] for block in self.keys]
+    self.size = len(keys)
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable, re-sorting everything for large batches
+    batch = list(pairs)
+    if len(batch) * 8 < self.size:
+      for key, value in batch:
+        self.add(key, value)
+      return
+    merged = sorted(list(self) + batch, key=lambda pair: pair[0])
+    self.rebuild([key for key, _ in merged], [value for _, value in merged])
+
+  def min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    return (self.keys[0][0], self.values[0][0])
+
+  def remove_min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    key = self.keys[0].pop(0)
+    value = self.values[0].pop(0)
+    if not self.keys[0]:
+      del self.keys[0]
+      del self.values[0]
+      del self.maxes[0]
+    self.size -= 1
+    return (key, value)
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    answer = []
+    while self.keys and len(answer) < k:
+      take = k - len(answer)
+      keys = self.keys[0]
+      values = self.values[0]
+      answer.extend(zip(keys[:take], values[:take]))
+      if take >= len(keys):
+        del self.keys[0]
+        del self.values[0]
+        del self.maxes[0]
+      else:
+        del keys[:take]
+        del values[:take]
+    self.size -= len(answer)
+    return answer
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing them
+    answer = []
+    for keys, values in zip(self.keys, self.values):
+      if len(answer) >= k:
+        break
+      take = k - len(answer)
+      answer.extend(zip(keys[:take], values[:take]))
+    return answer
+
+  def __iter__(self):
+    # Generate the key-value pairs in key order
+    for keys, values in zip(self.keys, self.values):
+      yield from zip(keys, values)
+
+  def find_range(self, start, stop):
+    # Generate the key-value pairs with start <= key < stop in key order
+    i = bisect_left(self.maxes, start)
+    if i == len(self.maxes):
+      return
+    j = bisect_left(self.keys[i], start)
+    while i < len(self.keys):
+      keys = self.keys[i]
+      values = self.values[i]
+      while j < len(keys):
+        if not keys[j] < stop:
+          return
+        yield (keys[j], values[j])
+        j += 1
+      i += 1
+      j = 0
+
+
+# A min-oriented priority queue implemented with a d-ary heap. Every position has up to
+# d children, so the heap is shallower than a binary one: add and upheap touch fewer
+# levels, at the price of comparing d children per level in downheap
+
+class DaryHeapPriorityQueue(HeapPriorityQueue):
+
+  DEFAULT_ARITY = 4
+
+  def __init__(self, d=DEFAULT_ARITY):
+    # Create an empty queue whose positions have up to d children
+    if d < 2:
+      raise ValueError('d must be at least 2')
+    super().__init__()
+    self.d = d
+
+  @classmethod
+  def from_pairs(cls, pairs, d=DEFAULT_ARITY):
+    # Build a priority queue from an iterable of key-value pairs in O(n) time
+    queue = cls(d)
+    queue.data = [cls.item(key, value) for key, value in pairs]
+    queue.heapify()
+    return queue
+
+  def upheap(self, j):
+    # Move the entry at index j up, shifting larger parents down into the hole
+    data = self.data
+    d = self.d
+    entry = data[j]
+    while j > 0:
+      parent = (j - 1) // d
+      above = data[parent]
+      if not entry < above:
+        break
+      data[j] = above
+      j = parent
+    data[j] = entry
+
+  def downheap(self, j):
+    # Move the entry at index j down, shifting the smallest child up into the hole
+    data = self.data
+    d = self.d
+    n = len(data)
+    entry = data[j]
+    first = d * j + 1
+    while first < n:
+      smallest = first
+      for child in range(first + 1, min(first + d, n)):
+        if data[child] < data[smallest]:
+          smallest = child
+      if not data[smallest] < entry:
+        break
+      data[j] = data[smallest]
+      j = smallest
+      first = d * j + 1
+    data[j] = entry
+
+  def heapify(self):
+    # Arrange the array into a heap bottom-up in O(n) time
+    for j in range((len(self.data) - 2) // self.d, -1, -1):
+      self.downheap(j)
+
+  def meld(self, other):
+    # Move every entry of other into this priority queue, leaving other empty
+    if not isinstance(other, DaryHeapPriorityQueue) or other.d != self.d:
+      raise TypeError('Priority queues must be d-ary heaps of the same arity')
+    start = len(self.data)
+    self.data.extend(other.data)
+    other.data = []
+    self.restore(start)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing them
+    data = self.data
+    d = self.d
+    n = len(data)
+    answer = []
+    if n == 0 or k <= 0:
+      return answer
+    frontier = HeapPriorityQueue()
+    frontier.add(data[0].key, 0)
+    while frontier and len(answer) < k:
+      key, j = frontier.remove_min()
+      answer.append((key, data[j].value))
+      for child in range(d * j + 1, min(d * j + d + 1, n)):
+        frontier.add(data[child].key, child)
+    return answer
+
+
+# A min-oriented priority queue implemented with a pairing heap. add and meld only link
+# two roots, so both run in O(1) time; remove_min pairs up the children of the removed
+# root in two passes and runs in O(log n) amortized time
+
+class PairingHeapPriorityQueue(PriorityQueue):
+
+  class Node(PriorityQueue.item):
+    # Heap-ordered tree node: child is the first child, next is the following sibling
+    __slots__ = ('child', 'next')
+
+    def __init__(self, key, value):
+      super().__init__(key, value)
+      self.child = None
+      self.next = None
+
+  def __init__(self):
+    self.root = None
+    self.size = 0
+
+  def __len__(self):
+    return self.size
+
+  def link(self, a, b):
+    # Make the root with the larger key the first child of the other and return the new root
+    if b < a:
+      a, b = b, a
+    b.next = a.child
+    a.child = b
+    return a
+
+  def add(self, key, value):
+    node = self.Node(key, value)
+    self.root = node if self.root is None else self.link(self.root, node)
+    self.size += 1
+
+  def min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    return (self.root.key, self.root.value)
+
+  def merge_pairs(self, first):
+    # Link a list of sibling trees pairwise left to right, then fold the pairs right to left
+    pairs = []
+    while first is not None:
+      a = first
+      b = a.next
+      if b is None:
+        pairs.append(a)
+        break
+      first = b.next
+      a.next = b.next = None
+      pairs.append(self.link(a, b))
+    if not pairs:
+      return None
+    root = pairs.pop()
+    while pairs:
+      root = self.link(pairs.pop(), root)
+    return root
+
+  def remove_min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    node = self.root
+    self.root = self.merge_pairs(node.child)
+    self.size -= 1
+    node.child = None
+    return (node.key, node.value)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing
+    # them. Only the children of already reported nodes are explored
+    answer = []
+    if self.root is None or k <= 0:
+      return answer
+    frontier = HeapPriorityQueue()
+    frontier.add(self.root.key, self.root)
+    while frontier and len(answer) < k:
+      key, node = frontier.remove_min()
+      answer.append((key, node.value))
+      child = node.child
+      while child is not None:
+        frontier.add(child.key, child)
+        child = child.next
+    return answer
+
+  def meld(self, other):
+    # Move every entry of other into this priority queue in O(1) time, leaving other empty
+    if type(self) is not type(other):
+      raise TypeError('Priority queues must be of the same type')
+    if other.root is not None:
+      self.root = other.root if self.root is None else self.link(self.root, other.root)
+      self.size += other.size
+      other.root = None
+      other.size = 0
+
+
+# A min-oriented heap priority queue for numeric keys that stores keys and values in
+# parallel arrays instead of item objects. Keys are compared directly, without a call
+# to item.__lt__, and live unboxed in a typed array
+
+from array import array
+
+class CompactHeapPriorityQueue(PriorityQueue):
+
+  def __init__(self, typecode='d'):
+    # Create an empty queue whose keys are stored in an array of the given typecode
+    self.keys = array(typecode)
+    self.values = []
+
+  @classmethod
+  def from_pairs(cls, pairs, typecode='d'):
+    # Build a priority queue from an iterable of key-value pairs in O(n) time
+    queue = cls(typecode)
+    keys = queue.keys
+    values = queue.values
+    for key, value in pairs:
+      keys.append(key)
+      values.append(value)
+    queue.heapify()
+    return queue
+
+  def __len__(self):
+    return len(self.values)
+
+  def upheap(self, j):
+    # Move the entry at index j up, shifting larger parents down into the hole
+    keys = self.keys
+    values = self.values
+    key = keys[j]
+    value = values[j]
+    while j > 0:
+      parent = (j - 1) >> 1
+      if not key < keys[parent]:
+        break
+      keys[j] = keys[parent]
+      values[j] = values[parent]
+      j = parent
+    keys[j] = key
+    values[j] = value
+
+  def downheap(self, j):
+    # Move the entry at index j down, shifting smaller children up into the hole
+    keys = self.keys
+    values = self.values
+    n = len(values)
+    key = keys[j]
+    value = values[j]
+    child = 2 * j + 1
+    while child < n:
+      right = child + 1
+      if right < n and keys[right] < keys[child]:
+        child = right
+      if not keys[child] < key:
+        break
+      keys[j] = keys[child]
+      values[j] = values[child]
+      j = child
+      child = 2 * j + 1
+    keys[j] = key
+    values[j] = value
+
+  def heapify(self):
+    # Arrange the arrays into a heap bottom-up in O(n) time
+    for j in range(len(self.values) // 2 - 1, -1, -1):
+      self.downheap(j)
+
+  def add_many(self, pairs):
+    # Add every key-value pair of an iterable, heapifying instead of sifting large batches
+    start = len(self.values)
+    for key, value in pairs:
+      self.keys.append(key)
+      self.values.append(value)
+    self.restore(start)
+
+  def restore(self, start):
+    # Restore the heap after entries were appended from index start onwards, heapifying
+    # when that is cheaper than sifting each new entry up
+    total = len(self.values)
+    if heapify_is_cheaper(total - start, total):
+      self.heapify()
+    else:
+      for j in range(start, total):
+        self.upheap(j)
+
+  def nsmallest(self, k):
+    # Return up to k key-value pairs with the smallest keys, in order, without removing them
+    keys = self.keys
+    values = self.values
+    n = len(values)
+    answer = []
+    if n == 0 or k <= 0:
+      return answer
+    frontier = CompactHeapPriorityQueue(keys.typecode)
+    frontier.add(keys[0], 0)
+    while frontier and len(answer) < k:
+      key, j = frontier.remove_min()
+      answer.append((key, values[j]))
+      child = 2 * j + 1
+      if child < n:
+        frontier.add(keys[child], child)
+      if child + 1 < n:
+        frontier.add(keys[child + 1], child + 1)
+    return answer
+
+  def pop_n(self, k):
+    # Remove and return up to k key-value pairs with the smallest keys, in order
+    keys = self.keys
+    values = self.values
+    if k >= len(values):
+      order = sorted(range(len(values)), key=keys.__getitem__)
+      answer = [(keys[j], values[j]) for j in order]
+      del keys[:]
+      values.clear()
+      return answer
+    answer = []
+    for _ in range(k):
+      key = keys.pop()
+      value = values.pop()
+      answer.append((keys[0], values[0]))
+      keys[0] = key
+      values[0] = value
+      self.downheap(0)
+    return answer
+
+  def add(self, key, value):
+    self.keys.append(key)
+    self.values.append(value)
+    self.upheap(len(self.values) - 1)
+
+  def min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    return (self.keys[0], self.values[0])
+
+  def remove_min(self):
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    key = self.keys.pop()
+    value = self.values.pop()
+    if not self.values:
+      return (key, value)
+    answer = (self.keys[0], self.values[0])
+    self.keys[0] = key
+    self.values[0] = value
+    self.downheap(0)
+    return answer
+
+  def pushpop(self, key, value):
+    # Add a key-value pair, then remove and return the pair with minimum key
+    if not self.values or not self.keys[0] < key:
+      return (key, value)
+    answer = (self.keys[0], self.values[0])
+    self.keys[0] = key
+    self.values[0] = value
+    self.downheap(0)
+    return answer
+
+  def replace(self, key, value):
+    # Remove and return the pair with minimum key, then add a key-value pair
+    if self.is_empty():
+      raise Empty('Priority queue is empty')
+    answer = (self.keys[0], self.values[0])
+    self.keys[0] = key
+    self.values[0] = value
+    self.downheap(0)
+    return answer
+
+
+# Test the implementation of the priority queue classes
+
+def test_priority_queue():
+    # Test locators of the adaptable heap through update and remove
+    adaptable = AdaptableHeapPriorityQueue()
+    a = adaptable.add(5, 'a')
+    b = adaptable.add(3, 'b')
+    c = adaptable.add(8, 'c')
+    assert adaptable.min() == (3, 'b')
+    adaptable.update(c, 1, 'c')
+    assert adaptable.min() == (1, 'c')
+    adaptable.update(c, 9, 'c')
+    assert adaptable.remove(b) == (3, 'b')
+    assert adaptable.remove_min() == (5, 'a')
+    assert len(adaptable) == 1
+
+    # Test stale locators are rejected
+    for stale in (a, b):
+      try:
+        adaptable.update(stale, 0, 'x')
+        assert False
+      except ValueError:
+        pass
+    try:
+      adaptable.remove(HeapPriorityQueue.item(0, 'x'))
+      assert False
+    except TypeError:
+      pass
+
+    # Test locators stay valid after meld and from_pairs builds a valid heap
+    other = AdaptableHeapPriorityQueue()
+    d = other.add(4, 'd')
+    e = other.add(6, 'e')
+    adaptable.meld(other)
+    assert len(other) == 0 and len(adaptable) == 3
+    adaptable.update(e, 0, 'e')
+    assert adaptable.remove(d) == (4, 'd')
+    assert [adaptable.remove_min() for _ in range(2)] == [(0, 'e'), (9, 'c')]
+    built = AdaptableHeapPriorityQueue.from_pairs([(k, str(k)) for k in (7, 2, 9, 4, 1)])
+    assert [built.remove_min()[0] for _ in range(5)] == [1, 2, 4, 7, 9]
+
+    # Test the locator variants of pushpop and replace
+    adaptable.add(5, 'f')
+    assert adaptable.pushpop(1, 'g') == (1, 'g')
+    pair, g = adaptable.replace_locator(7, 'g')
+    assert pair == (5, 'f')
+    adaptable.update(g, 2, 'g')
+    assert adaptable.pushpop_locator(3, 'h')[0] == (2, 'g')
+
+    # Test add_many, nsmallest and pop_n on every engine, including k <= 0 and k >= len
+    pairs = [(4, 'a'), (1, 'b'), (3, 'c'), (5, 'd'), (2, 'e')]
+    ordered = sorted(pairs)
+    engines = (UnsortedPriorityQueue, CachedUnsortedPriorityQueue, SortedPriorityQueue,
+               HeapPriorityQueue, AdaptableHeapPriorityQueue, DaryHeapPriorityQueue,
+               IndexedSortedPriorityQueue, CompactHeapPriorityQueue, PairingHeapPriorityQueue)
+    for engine in engines:
+      queue = engine()
+      queue.add_many(pairs)
+      assert len(queue) == 5
+      if hasattr(queue, 'nsmallest'):
+        assert queue.nsmallest(0) == [] and queue.nsmallest(-1) == []
+        assert queue.nsmallest(2) == ordered[:2] and queue.nsmallest(9) == ordered
+      assert queue.pop_n(0) == [] and queue.pop_n(-1) == [] and len(queue) == 5
+      assert queue.pop_n(2) == ordered[:2] and len(queue) == 3
+      assert queue.pop_n(9) == ordered[2:] and queue.is_empty()
+
+    # Test d-ary and pairing heaps against sorted order, across meld
+    for engine in (lambda: DaryHeapPriorityQueue(3), PairingHeapPriorityQueue):
+      first = engine()
+      second = engine()
+      first.add_many((k, str(k)) for k in (9, 4, 7, 1))
+      second.add_many((k, str(k)) for k in (8, 2, 6, 3, 5))
+      assert first.remove_min() == (1, '1')
+      first.meld(second)
+      assert len(first) == 8 and second.is_empty()
+      assert first.nsmallest(3) == [(2, '2'), (3, '3'), (4, '4')]
+      assert [first.remove_min()[0] for _ in range(8)] == [2, 3, 4, 5, 6, 7, 8, 9]
+    try:
+      DaryHeapPriorityQueue(3).meld(DaryHeapPriorityQueue(4))
+      assert False
+    except TypeError:
+      pass
+    wide = DaryHeapPriorityQueue.from_pairs(((k * 7) % 50, k) for k in range(50))
+    assert [wide.remove_min()[0] for _ in range(50)] == list(range(50))
+
+    # Test the indexed sorted queue with small blocks, so adds split blocks
+    indexed = IndexedSortedPriorityQueue(load=2)
+    for k in (5, 1, 9, 3, 7, 2, 8, 4, 6, 0):
+      indexed.add(k, str(k))
+    assert len(indexed.keys) > 1 and all(len(block) <= 4 for block in indexed.keys)
+    assert indexed.maxes == [block[-1] for block in indexed.keys]
+    assert [key for key, _ in indexed] == list(range(10))
+    assert list(indexed.find_range(2, 7)) == [(k, str(k)) for k in range(2, 7)]
+    assert list(indexed.find_range(-5, 1)) == [(0, '0')] and list(indexed.find_range(10, 20)) == []
+
+    # Test both add_many branches: single adds for a small batch, a rebuild for a large one
+    indexed.add_many([(4.5, 'small')])
+    assert indexed.nsmallest(6)[-1] == (4.5, 'small') and len(indexed) == 11
+    indexed.add_many((k + 0.5, 'large') for k in range(10))
+    assert len(indexed) == 21 and all(len(block) <= 4 for block in indexed.keys)
+    assert indexed.maxes == [block[-1] for block in indexed.keys]
+    assert list(indexed.find_range(3, 5)) == [(3, '3'), (3.5, 'large'), (4, '4'), (4.5, 'small'), (4.5, 'large')]
+    assert indexed.pop_n(3) == [(0, '0'), (0.5, 'large'), (1, '1')] and indexed.min() == (1.5, 'large')
+
+    # Test the cached minimum of the unsorted queue is kept by add, dropped by batch and
+    # removal operations, and rebuilt by a rescan
+    cached = CachedUnsortedPriorityQueue()
+    cached.add(5, 'a')
+    cached.add(3, 'b')
+    cached.add(4, 'c')
+    assert cached.small.element().key == 3 and cached.min() == (3, 'b')
+    cached.add_many([(1, 'd'), (6, 'e')])
+    assert cached.small is None
+    assert cached.min() == (1, 'd') and cached.small.element().key == 1
+    assert cached.remove_min() == (1, 'd') and cached.small is None
+    assert cached.min() == (3, 'b')
+    cached.add(2, 'f')
+    assert cached.small.element().key == 2
+    assert cached.pop_n(2) == [(2, 'f'), (3, 'b')] and cached.small is None
+    cached.add(7, 'g') # a stale cache is not updated by add, the next min() rescans
+    assert cached.small is None and cached.min() == (4, 'c')
+    assert cached.pop_n(9) == [(4, 'c'), (5, 'a'), (6, 'e'), (7, 'g')]
+    cached.add(8, 'h')
+    assert cached.min() == (8, 'h')
+
+    # Test the compact heap keeps keys in a typed array alongside their values
+    compact = CompactHeapPriorityQueue.from_pairs((k, str(k)) for k in (6, 2, 8, 4))
+    assert compact.keys.typecode == 'd' and compact.min() == (2.0, '2')
+    compact.add(1, '1')
+    compact.add_many([(7, '7')])
+    compact.add_many((k + 0.5, 'batch') for k in range(10))
+    assert len(compact) == 16 and len(compact.keys) == len(compact.values)
+    assert compact.pushpop(0, '0') == (0, '0') and compact.pushpop(3, '3') == (0.5, 'batch')
+    assert compact.replace(9, '9') == (1.0, '1')
+    assert compact.remove_min() == (1.5, 'batch') and compact.remove_min() == (2.0, '2')
+    keys = [key for key, _ in compact.pop_n(len(compact))]
+    assert keys == sorted(keys) and len(keys) == 14 and compact.is_empty()
+    try:
+      compact.min()
+      assert False
+    except Empty:
+      pass
+
+    # Test equal keys keep insertion order when merged into a sorted list
+    merged = SortedPriorityQueue()
+    merged.add(1, 'first')
+    merged.add_many([(2, 'x'), (1, 'second'), (1, 'third')])
+    assert merged.pop_n(4) == [(1, 'first'), (1, 'second'), (1, 'third'), (2, 'x')]
+
+    # Test both branches of restore: sifting a small batch up and heapifying a large one
+    heap = HeapPriorityQueue.from_pairs((k, k) for k in range(100, 0, -1))
+    rebuilt = []
+    heap.heapify = lambda: rebuilt.append(True) or HeapPriorityQueue.heapify(heap)
+    heap.add_many([(0.5, 'small')])
+    assert not rebuilt and heap.min() == (0.5, 'small')
+    heap.add_many((k - 0.25, k) for k in range(50))
+    assert rebuilt and heap.pop_n(4) == [(-0.25, 0), (0.5, 'small'), (0.75, 1), (1, 1)]
+
+    print("All tests passed!")
+
+# Run the test function
+test_priority_queue()
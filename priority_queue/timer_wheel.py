@@ -0,0 +1,210 @@
+# Implementing a Hierarchical Timing Wheel
+
+"""
+A timer scheduler for many short-lived timers that are mostly cancelled before they
+fire. Time is divided into ticks of a fixed resolution. The wheel has several levels
+of slots: level 0 holds one tick per slot, and every higher level covers a whole turn
+of the level below in each slot. A timer is stored in the lowest level whose block
+still contains both the current tick and its own tick, so schedule and cancel are O(1).
+As time advances, the slots of higher levels are cascaded down until the timer reaches
+level 0 and expires. Deadlines beyond the span of the top level wait in an adaptable
+heap and move into the wheel once they come within reach.
+
+"""
+
+from priority_queue.priority_queue import AdaptableHeapPriorityQueue
+
+class TimerWheel:
+
+  class Timer:
+    # Handle of a scheduled timer, returned by schedule and accepted by cancel
+    __slots__ = ('container', 'deadline', 'value', 'tick', 'slot', 'locator')
+
+    def __init__(self, container, deadline, value, tick):
+      self.container = container
+      self.deadline = deadline
+      self.value = value
+      self.tick = tick
+      self.slot = None # dictionary of the wheel slot holding the timer, if any
+      self.locator = None # locator in the overflow heap, if any
+
+  def __init__(self, resolution=0.001, slots=64, levels=4, start=0.0):
+    # Create an empty wheel whose ticks are resolution long, starting at time start
+    if resolution <= 0:
+      raise ValueError('resolution must be positive')
+    if slots < 2 or levels < 1:
+      raise ValueError('wheel needs at least 2 slots and 1 level')
+    self.resolution = resolution
+    self.slots = slots
+    self.levels = levels
+    self.origin = start
+    self.current = 0
+    self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+    self.overflow = AdaptableHeapPriorityQueue()
+    self.in_wheel = 0
+    self.size = 0
+
+  def __len__(self):
+    # Return the number of pending timers
+    return self.size
+
+  def is_empty(self):
+    return self.size == 0
+
+  def to_tick(self, t):
+    # Return the tick containing time t
+    return int((t - self.origin) // self.resolution)
+
+  def place(self, timer):
+    # Store timer in the lowest level whose block holds both its tick and the current one
+    tick = timer.tick
+    current = self.current
+    if tick <= current:
+      slot = self.wheels[0][current % self.slots]
+    else:
+      slot = None
+      for level in range(self.levels):
+        tick //= self.slots
+        current //= self.slots
+        if tick == current:
+          slot = self.wheels[level][(timer.tick // self.slots ** level) % self.slots]
+          break
+      if slot is None:
+        timer.locator = self.overflow.add(timer.tick, timer)
+        return
+    slot[timer] = None
+    timer.slot = slot
+    self.in_wheel += 1
+
+  def schedule(self, deadline, value):
+    # Schedule value to expire at deadline and return a handle that can cancel it
+    timer = self.Timer(self, deadline, value, self.to_tick(deadline))
+    self.place(timer)
+    self.size += 1
+    return timer
+
+  def cancel(self, handle):
+    # Cancel a pending timer. Return True if it was pending, False if it already
+    # expired or was cancelled before
+    if not isinstance(handle, self.Timer):
+      raise TypeError('handle must be a Timer instance')
+    if handle.container is not self:
+      raise ValueError('handle does not belong to this wheel')
+    if handle.slot is not None:
+      del handle.slot[handle]
+      handle.slot = None
+      self.in_wheel -= 1
+    elif handle.locator is not None:
+      self.overflow.remove(handle.locator)
+      handle.locator = None
+    else:
+      return False
+    self.size -= 1
+    return True
+
+  def pull_overflow(self):
+    # Move overflow timers that came within the span of the wheel into the wheel
+    span = self.slots ** self.levels
+    block = self.current // span
+    while not self.overflow.is_empty() and self.overflow.min()[0] // span <= block:
+      _, timer = self.overflow.remove_min()
+      timer.locator = None
+      self.place(timer)
+
+  def cascade(self):
+    # Re-place the timers of every higher level slot whose block starts at the current tick
+    current = self.current
+    for level in range(1, self.levels):
+      current //= self.slots
+      index = current % self.slots
+      slot = self.wheels[level][index]
+      if slot:
+        timers = list(slot)
+        slot.clear()
+        self.in_wheel -= len(timers)
+        for timer in timers:
+          self.place(timer)
+      if index != 0:
+        break
+
+  def next_event(self, target):
+    # Return the first tick after the current one at which a non-empty slot of some level
+    # is reached or an overflow timer comes due, capped at target
+    following = target
+    if not self.overflow.is_empty():
+      following = min(following, self.overflow.min()[0])
+    if self.in_wheel:
+      block = 1
+      for level in range(self.levels):
+        turn = block * self.slots
+        base = self.current // turn * turn
+        wheel = self.wheels[level]
+        for index in range((self.current // block) % self.slots + 1, self.slots):
+          if base + index * block >= following:
+            break
+          if wheel[index]:
+            following = base + index * block
+            break
+        block = turn
+    return max(self.current + 1, following)
+
+  def pop_expired(self, now):
+    # Remove and return the (deadline, value) pairs of all timers whose deadline is not
+    # after now, ordered by deadline
+    target = self.to_tick(now)
+    expired = []
+    while True:
+      slot = self.wheels[0][self.current % self.slots]
+      if slot:
+        due = [timer for timer in slot if timer.deadline <= now]
+        for timer in due:
+          del slot[timer]
+          timer.slot = None
+        self.in_wheel -= len(due)
+        expired.extend(due)
+      if self.current >= target:
+        break
+      # Jump over empty slots straight to the next tick where a slot expires or cascades
+      self.current = self.next_event(target)
+      if self.current % self.slots == 0:
+        self.cascade()
+      self.pull_overflow()
+    self.size -= len(expired)
+    expired.sort(key=lambda timer: timer.deadline)
+    return [(timer.deadline, timer.value) for timer in expired]
+
+
+# Test the implementation of TimerWheel class
+
+def test_timer_wheel():
+    wheel = TimerWheel(resolution=1, slots=4, levels=2)
+
+    # Test schedule across level 0, level 1 and the overflow heap
+    near = wheel.schedule(2, 'near')
+    wheel.schedule(9, 'middle')
+    far = wheel.schedule(100, 'far')
+    wheel.schedule(0.5, 'now')
+    assert len(wheel) == 4
+
+    # Test pop_expired returns due timers in deadline order
+    assert wheel.pop_expired(1) == [(0.5, 'now')]
+    assert wheel.pop_expired(10) == [(2, 'near'), (9, 'middle')]
+
+    # Test cancel of pending and expired timers
+    assert wheel.cancel(far)
+    assert not wheel.cancel(far)
+    assert not wheel.cancel(near)
+    assert wheel.is_empty()
+    assert wheel.pop_expired(1000) == []
+
+    # Test a long idle gap is crossed by jumping between non-empty slots
+    wheel = TimerWheel()
+    late = wheel.schedule(3600, 'late')
+    wheel.schedule(1800.5, 'half')
+    assert wheel.pop_expired(3599) == [(1800.5, 'half')]
+    assert wheel.pop_expired(3600) == [(3600, 'late')]
+    assert late.slot is None and wheel.is_empty()
+
+    print("All tests passed!")
+
+test_timer_wheel()
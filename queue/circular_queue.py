@@ -6,6 +6,8 @@ class Empty(Exception):
 class CircularQueue:
   
   class Node: 
+    __slots__ = ('element', 'next') # streamline memory usage
+
     def __init__(self, element, next):
       self.element = element
       self.next = next
@@ -53,6 +55,47 @@ class CircularQueue:
     self._tail = newest_ele # update tail to new node
     self._size += 1
     
+  def enqueue_many(self, items):
+    # Add every element of an iterable to the end of the queue by building a chain of
+    # nodes and splicing it in after the tail in one step
+    head = tail = None
+    count = 0
+    for item in items:
+      newest_ele = self.Node(item, None)
+      if head is None:
+        head = newest_ele
+      else:
+        tail.next = newest_ele
+      tail = newest_ele
+      count += 1
+    if count == 0:
+      return
+    if self.is_empty():
+      tail.next = head # chain closes on itself
+    else:
+      tail.next = self._tail.next # chain tail points to old head
+      self._tail.next = head # old tail points to chain head
+    self._tail = tail
+    self._size += count
+
+  def dequeue_many(self, k):
+    # Remove and return up to k elements from the front of the queue as a list, unlinking
+    # the whole run of nodes at once
+    k = min(k, self._size)
+    if k <= 0:
+      return []
+    elements = []
+    walk = self._tail.next
+    for _ in range(k):
+      elements.append(walk.element)
+      walk = walk.next
+    if k == self._size:
+      self._tail = None
+    else:
+      self._tail.next = walk
+    self._size -= k
+    return elements
+
   def rotate(self):
     if self._size > 0:
       self._tail = self._tail.next # rotate the tail to the next node
@@ -100,4 +143,10 @@ def test_circular_queue():
     queue.rotate()
     print(queue.first())  # Expected output: 30
 
+    # Test batch operations
+    queue.enqueue_many([50, 60, 70])
+    print(queue.dequeue_many(3))  # Expected output: [30, 40, 50]
+    print(queue.dequeue_many(10))  # Expected output: [60, 70]
+    print(queue.is_empty())  # Expected output: True
+
 test_circular_queue()
\ No newline at end of file
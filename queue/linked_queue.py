@@ -6,6 +6,8 @@ class Empty(Exception):
 class LinkedQueue:
   
   class Node: 
+    __slots__ = ('element', 'next') # streamline memory usage
+
     def __init__(self, element, next):
       self.element = element
       self.next = next
@@ -54,6 +56,70 @@ class LinkedQueue:
     self._size += 1
 
 
+# Implimenting queue with an unrolled singly linked list. Each node holds a fixed-size
+# block of elements, so a node is only allocated once per BLOCK_SIZE enqueues
+
+class UnrolledLinkedQueue:
+
+  BLOCK_SIZE = 64
+
+  class Block:
+    __slots__ = ('data', 'next') # streamline memory usage
+
+    def __init__(self, size):
+      self.data = [None] * size
+      self.next = None
+
+  def __init__(self):
+    # Create an empty queue 
+    self._head = self._tail = self.Block(self.BLOCK_SIZE)
+    self._head_index = 0 # index of the first element in the head block
+    self._tail_index = 0 # index of the next free slot in the tail block
+    self._size = 0
+
+  def __len__(self):
+    # Return the number of elements in the queue
+    return self._size
+
+  def is_empty(self):
+    # Return True if the queue is empty, False otherwise
+    return self._size == 0
+
+  def first(self):
+    # Return the element at the front of the queue without removing it
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return self._head.data[self._head_index]
+
+  def dequeue(self):
+    # Remove and return the element at the front of the queue
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    answer = self._head.data[self._head_index]
+    self._head.data[self._head_index] = None # release the reference held by the block
+    self._head_index += 1
+    self._size -= 1
+    if self._size == 0:
+      self._head = self._tail # reuse the tail block from its start
+      self._head.next = None
+      self._head_index = self._tail_index = 0
+    elif self._head_index == self.BLOCK_SIZE:
+      self._head = self._head.next
+      self._head_index = 0
+    return answer
+
+  def enqueue(self, item):
+    # Add an element to the end of the queue, opening a new block if the tail is full
+    if self._tail_index == self.BLOCK_SIZE:
+      block = self.Block(self.BLOCK_SIZE)
+      self._tail.next = block
+      self._tail = block
+      self._tail_index = 0
+    self._tail.data[self._tail_index] = item
+    self._tail_index += 1
+    self._size += 1
+
+
 # Test the implementation of LinkedQueue class
 
 def test_linked_queue():
@@ -83,4 +149,20 @@ def test_linked_queue():
     except Empty as e:
         print(e)  # Expected output: "Queue is empty"
 
-test_linked_queue()
\ No newline at end of file
+test_linked_queue()
+
+
+def test_unrolled_linked_queue():
+    queue = UnrolledLinkedQueue()
+
+    # Test enqueue and dequeue across block boundaries
+    for k in range(150):
+      queue.enqueue(k)
+    print(queue.first())  # Expected output: 0
+    print(len(queue))  # Expected output: 150
+    print([queue.dequeue() for _ in range(3)])  # Expected output: [0, 1, 2]
+    while not queue.is_empty():
+      last = queue.dequeue()
+    print(last)  # Expected output: 149
+
+test_unrolled_linked_queue()
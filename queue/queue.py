@@ -16,12 +16,27 @@ The operations that we perform on the queue:
 class ArrayQueue:
   
   DEFAULT_CAPACITY = 10
-
-  def __init__(self):
-    # Create an empty queue initialized with None value for capacity
-    self._data = [None]*ArrayQueue.DEFAULT_CAPACITY
+  GROWTH_FACTOR = 2
+  SHRINK_THRESHOLD = 0.25
+
+  def __init__(self, capacity=DEFAULT_CAPACITY, growth_factor=GROWTH_FACTOR, shrink_threshold=SHRINK_THRESHOLD):
+    # Create an empty queue initialized with None value for capacity. A full queue grows
+    # by growth_factor; once occupancy falls below shrink_threshold the capacity is divided
+    # by growth_factor, never going under the initial capacity. The shrunk queue is still
+    # far from full, so alternating enqueues and dequeues cannot resize back and forth.
+    # A shrink_threshold of 0 disables shrinking
+    if capacity < 1:
+      raise ValueError('capacity must be positive')
+    if growth_factor <= 1:
+      raise ValueError('growth_factor must be greater than 1')
+    if not 0 <= shrink_threshold < 1 / growth_factor:
+      raise ValueError('shrink_threshold must be between 0 and 1 / growth_factor')
+    self._data = [None]*capacity
     self._size = 0
     self._front = 0
+    self._min_capacity = capacity
+    self._growth_factor = growth_factor
+    self._shrink_threshold = shrink_threshold
 
   def __len__(self):
     # Return the number of elements in the queue
@@ -47,25 +62,72 @@ class ArrayQueue:
     self._front = (self._front + 1) % len(self._data) # Move the front pointer to next element using cicular buffer
 
     self._size -= 1
+    self.shrink()
     return element
+
+  def shrink(self):
+    # Reduce the capacity by the growth factor while occupancy is below the shrink threshold,
+    # dividing as many times as needed so a drained burst is released in one resize
+    capacity = len(self._data)
+    target = capacity
+    while target > self._min_capacity and self._size < target * self._shrink_threshold:
+      following = max(self._min_capacity, self._size + 1, int(target / self._growth_factor))
+      if following >= target:
+        break
+      target = following
+    if target < capacity:
+      self.resize(target) # Release memory after a burst
+
+  def dequeue_many(self, k):
+    # Remove and return up to k elements from the front of the queue as a list
+    k = min(k, self._size)
+    if k <= 0:
+      return []
+    capacity = len(self._data)
+    end = self._front + k
+    if end <= capacity:
+      elements = self._data[self._front:end]
+      self._data[self._front:end] = [None]*k
+    else:
+      end -= capacity # The run wraps around the end of the array
+      elements = self._data[self._front:] + self._data[:end]
+      self._data[self._front:] = [None]*(capacity - self._front)
+      self._data[:end] = [None]*end
+    self._front = end % capacity
+    self._size -= k
+    self.shrink()
+    return elements
   
   def enqueue(self, item):
     # Add an element to the end of the queue
     if self._size == len(self._data): # Check if space available in queue
-      self.resize(2*self._size) # Resize the queue to double size
+      self.resize(max(self._size + 1, int(self._size * self._growth_factor))) # Grow the queue by the growth factor
     avail = (self._front + self._size) % len(self._data) # Calculate the next available position
     self._data[avail] = item
     self._size += 1
 
-  def resize(self, new_capacity):
-    # Resize the queue to new capacity
-    old_capacity = self._data
-    self._data = [None]*new_capacity
-    for k in range(self._size):
-      self._data[k] = old_capacity[self._front] # Copying the elements from old capacity queue to new capacity queue at correct position
-
-      self._front = (self._front + 1) % len(self._data) # Move to the next element in the old array using circular buffer
+  def enqueue_many(self, items):
+    # Add every element of an iterable to the end of the queue with at most two slice copies
+    items = list(items)
+    count = len(items)
+    if self._size + count > len(self._data): # Check if space available in queue
+      self.resize(max(self._size + count, int(len(self._data) * self._growth_factor)))
+    capacity = len(self._data)
+    avail = (self._front + self._size) % capacity # Calculate the next available position
+    head = min(count, capacity - avail) # Number of elements that fit before the end of the array
+    self._data[avail:avail + head] = items[:head]
+    self._data[:count - head] = items[head:]
+    self._size += count
 
+  def resize(self, new_capacity):
+    # Resize the queue to new capacity, copying the elements with at most two slices
+    old = self._data
+    end = self._front + self._size
+    if end <= len(old):
+      elements = old[self._front:end]
+    else:
+      elements = old[self._front:] + old[:end - len(old)] # The elements wrap around the end of the old array
+    self._data = elements + [None]*(new_capacity - self._size)
     self._front = 0
 
 
@@ -103,6 +165,36 @@ def test_queue():
     except Empty as e:
         print(e)  # Expected output: "Queue is empty"
 
+    # Test growth and shrinking after a burst
+    queue = ArrayQueue(capacity=4, growth_factor=2, shrink_threshold=0.25)
+    for k in range(100):
+        queue.enqueue(k)
+    print(len(queue._data))  # Expected output: 128
+    for k in range(98):
+        queue.dequeue()
+    print(len(queue._data))  # Expected output: 8
+    print(queue.dequeue(), queue.dequeue())  # Expected output: 98 99
+
+    # Test batch operations across the end of the array
+    queue = ArrayQueue(capacity=8)
+    queue.enqueue_many(range(6))
+    print(queue.dequeue_many(4))  # Expected output: [0, 1, 2, 3]
+    queue.enqueue_many(range(6, 12))
+    print(queue.dequeue_many(100))  # Expected output: [4, 5, 6, 7, 8, 9, 10, 11]
+
+    # Test draining a burst in one batch releases the memory at once
+    queue = ArrayQueue()
+    queue.enqueue_many(range(100000))
+    print(len(queue.dequeue_many(100000)), len(queue._data))  # Expected output: 100000 10
+
+    # Test shrinking stops once the capacity cannot go below the occupancy
+    queue = ArrayQueue(capacity=1, growth_factor=1.5, shrink_threshold=0.6)
+    for k in range(20):
+        queue.enqueue(k)
+    for k in range(19):
+        queue.dequeue()
+    print(queue.first(), len(queue._data))  # Expected output: 19 2
+
 
 test_queue()
 
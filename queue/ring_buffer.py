@@ -0,0 +1,161 @@
+# Fixed capacity ring buffer over a typed array
+
+"""
+A queue of fixed-width numeric samples stored unboxed in an array. The readable region
+can be handed to consumers as at most two memoryview segments (two when it wraps around
+the end of the array), so data can be processed without copying and then released
+with consume(). When the buffer is full, enqueue either rejects the new element or, in
+overwrite mode, drops the oldest one.
+
+The operations that we perform on the ring buffer:
+1) len()
+2) is_empty()
+3) is_full()
+4) first()
+5) enqueue() / enqueue_many()
+6) dequeue() / dequeue_many()
+7) readable()
+8) consume()
+
+"""
+
+from array import array
+
+class Empty(Exception):
+  pass
+
+class Full(Exception):
+  pass
+
+class TypedRingBuffer:
+
+  def __init__(self, capacity, typecode='d', overwrite=False):
+    # Create an empty buffer of capacity elements of the given array typecode
+    if capacity < 1:
+      raise ValueError('capacity must be positive')
+    self._data = array(typecode, bytes(capacity * array(typecode).itemsize))
+    self._view = memoryview(self._data) # the array is never resized, so one view serves all reads and writes
+    self._front = 0
+    self._size = 0
+    self.overwrite = overwrite
+
+  def __len__(self):
+    # Return the number of elements in the buffer
+    return self._size
+
+  def capacity(self):
+    # Return the maximum number of elements the buffer can hold
+    return len(self._data)
+
+  def is_empty(self):
+    # Return True if the buffer is empty, False otherwise
+    return self._size == 0
+
+  def is_full(self):
+    # Return True if the buffer is full, False otherwise
+    return self._size == len(self._data)
+
+  def first(self):
+    # Return the element at the front of the buffer without removing it
+    if self.is_empty():
+      raise Empty('Ring buffer is empty')
+    return self._data[self._front]
+
+  def enqueue(self, item):
+    # Add an element at the end, dropping the oldest one or raising Full if there is no room
+    capacity = len(self._data)
+    if self._size == capacity:
+      if not self.overwrite:
+        raise Full('Ring buffer is full')
+      self._data[self._front] = item # the slot of the oldest element becomes the newest
+      self._front = (self._front + 1) % capacity
+      return
+    self._data[(self._front + self._size) % capacity] = item
+    self._size += 1
+
+  def enqueue_many(self, items):
+    # Add a batch of elements with at most two slice copies. Without overwrite the whole
+    # batch is rejected with Full if it does not fit
+    batch = array(self._data.typecode, items)
+    capacity = len(self._data)
+    count = len(batch)
+    if self._size + count > capacity:
+      if not self.overwrite:
+        raise Full('Ring buffer is full')
+      if count >= capacity:
+        batch = batch[count - capacity:] # only the newest capacity elements survive
+        count = capacity
+      self.consume(self._size + count - capacity)
+    avail = (self._front + self._size) % capacity
+    head = min(count, capacity - avail)
+    self._view[avail:avail + head] = batch[:head]
+    self._view[:count - head] = batch[head:]
+    self._size += count
+
+  def readable(self):
+    # Return the readable region as a list of zero, one or two memoryview segments in
+    # FIFO order. The views stay valid until the elements are consumed
+    view = self._view
+    end = self._front + self._size
+    if self._size == 0:
+      return []
+    if end <= len(self._data):
+      return [view[self._front:end]]
+    return [view[self._front:], view[:end - len(self._data)]]
+
+  def consume(self, k):
+    # Release the first k elements of the readable region without copying them
+    if not 0 <= k <= self._size:
+      raise ValueError('cannot consume more elements than are readable')
+    self._front = (self._front + k) % len(self._data)
+    self._size -= k
+
+  def dequeue(self):
+    # Remove and return the element at the front of the buffer
+    if self.is_empty():
+      raise Empty('Ring buffer is empty')
+    element = self._data[self._front]
+    self.consume(1)
+    return element
+
+  def dequeue_many(self, k):
+    # Remove and return up to k elements from the front as a new array
+    k = max(0, min(k, self._size))
+    answer = array(self._data.typecode)
+    for segment in self.readable():
+      if len(answer) == k:
+        break
+      answer.frombytes(segment[:k - len(answer)].tobytes())
+    self.consume(k)
+    return answer
+
+
+# Test the implementation of TypedRingBuffer class
+
+def test_ring_buffer():
+    buffer = TypedRingBuffer(4, 'i')
+
+    # Test enqueue, first and reject-when-full
+    buffer.enqueue_many([1, 2, 3])
+    buffer.enqueue(4)
+    print(buffer.first())  # Expected output: 1
+    try:
+        buffer.enqueue(5)
+    except Full as e:
+        print(e)  # Expected output: "Ring buffer is full"
+
+    # Test zero-copy views of a wrapped readable region
+    print(buffer.dequeue(), buffer.dequeue())  # Expected output: 1 2
+    buffer.enqueue_many([5, 6])
+    print([segment.tolist() for segment in buffer.readable()])  # Expected output: [[3, 4], [5, 6]]
+    buffer.consume(3)
+    print(buffer.dequeue_many(-1).tolist(), len(buffer))  # Expected output: [] 1
+    print(buffer.dequeue_many(10).tolist())  # Expected output: [6]
+
+    # Test overwrite-oldest policy
+    overwriting = TypedRingBuffer(3, 'd', overwrite=True)
+    overwriting.enqueue_many([1.0, 2.0, 3.0, 4.0])
+    overwriting.enqueue(5.0)
+    print(overwriting.dequeue_many(3).tolist())  # Expected output: [3.0, 4.0, 5.0]
+
+test_ring_buffer()
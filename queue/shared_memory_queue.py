@@ -0,0 +1,201 @@
+# Queue of byte records in shared memory, usable across processes
+
+"""
+A ring buffer placed in a multiprocessing.shared_memory block, so a producer process
+and a consumer process can exchange byte records without pickling them through a pipe.
+The creating process picks a name (or gets a generated one) and other processes attach
+to the same queue by that name.
+
+Layout of the shared block:
+  header  head, tail and capacity as little-endian unsigned 64-bit integers
+  ring    capacity bytes holding records, each a 4-byte length followed by its payload
+
+head and tail are byte offsets that only ever increase; the position in the ring is the
+offset modulo capacity, and records may wrap around the end of the ring. As in
+SPSCQueue, only the producer writes tail and only the consumer writes head, so one
+producer and one consumer need no lock. Each side copies the record before publishing
+its new offset, so the other side never touches bytes that are still being used.
+
+"""
+
+import struct
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+class Empty(Exception):
+  pass
+
+class Full(Exception):
+  pass
+
+# Serializes the temporary replacement of resource_tracker.register in attach(), so a block
+# created by another thread meanwhile is still registered
+_register_lock = threading.Lock()
+
+class SharedMemoryQueue:
+
+  HEADER = struct.Struct('<QQQ') # head, tail, capacity
+  LENGTH = struct.Struct('<I') # length prefix of every record
+
+  def __init__(self, shm):
+    # Wrap an existing shared memory block; use create() or attach() instead
+    self._shm = shm
+    self._buf = shm.buf
+    self._capacity = self.HEADER.unpack_from(self._buf, 0)[2]
+    self._base = self.HEADER.size
+
+  @classmethod
+  def create(cls, capacity, name=None):
+    # Create a new shared queue whose ring holds capacity bytes of records and length prefixes
+    if capacity <= cls.LENGTH.size:
+      raise ValueError('capacity must leave room for at least one record')
+    shm = shared_memory.SharedMemory(name=name, create=True, size=cls.HEADER.size + capacity)
+    cls.HEADER.pack_into(shm.buf, 0, 0, 0, capacity)
+    return cls(shm)
+
+  @classmethod
+  def attach(cls, name):
+    # Attach to a shared queue created by another process under the given name
+    try:
+      shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+      # Before Python 3.13 attaching registers the block with this process's resource
+      # tracker, which unlinks it when the process exits and destroys the queue for everyone
+      # else. Unregistering afterwards would also drop the creator's entry when both share a
+      # tracker (same process or forked child), so skip the registration while attaching
+      with _register_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+          shm = shared_memory.SharedMemory(name=name)
+        finally:
+          resource_tracker.register = register
+    return cls(shm)
+
+  @property
+  def name(self):
+    # Return the name other processes use to attach to this queue
+    return self._shm.name
+
+  def capacity(self):
+    # Return the size of the ring in bytes
+    return self._capacity
+
+  def offsets(self):
+    # Return the current head and tail offsets
+    head, tail, _ = self.HEADER.unpack_from(self._buf, 0)
+    return head, tail
+
+  def used_bytes(self):
+    # Return the number of ring bytes taken by pending records and their length prefixes
+    head, tail = self.offsets()
+    return tail - head
+
+  def is_empty(self):
+    # Return True if no record is pending, False otherwise
+    head, tail = self.offsets()
+    return head == tail
+
+  def write(self, offset, data):
+    # Copy data into the ring at offset, wrapping around the end of the ring
+    start = offset % self._capacity
+    first = min(len(data), self._capacity - start)
+    base = self._base
+    self._buf[base + start:base + start + first] = data[:first]
+    self._buf[base:base + len(data) - first] = data[first:]
+
+  def read(self, offset, length):
+    # Return a copy of length bytes of the ring at offset, wrapping around the end of the ring
+    start = offset % self._capacity
+    first = min(length, self._capacity - start)
+    base = self._base
+    data = bytes(self._buf[base + start:base + start + first])
+    if first < length:
+      data += bytes(self._buf[base:base + length - first])
+    return data
+
+  def put(self, record):
+    # Add a byte record to the end of the queue (producer side), raise Full if there is no room
+    record = memoryview(record).cast('B')
+    need = self.LENGTH.size + len(record)
+    if need > self._capacity:
+      raise ValueError('record is larger than the queue')
+    head, tail = self.offsets()
+    if self._capacity - (tail - head) < need:
+      raise Full('Queue is full')
+    self.write(tail, self.LENGTH.pack(len(record)))
+    self.write(tail + self.LENGTH.size, record)
+    struct.pack_into('<Q', self._buf, 8, tail + need) # publish the record to the consumer
+
+  def get(self):
+    # Remove and return the record at the front of the queue (consumer side), raise Empty if
+    # there is none
+    head, tail = self.offsets()
+    if head == tail:
+      raise Empty('Queue is empty')
+    length = self.LENGTH.unpack(self.read(head, self.LENGTH.size))[0]
+    record = self.read(head + self.LENGTH.size, length)
+    struct.pack_into('<Q', self._buf, 0, head + self.LENGTH.size + length) # hand the bytes back to the producer
+    return record
+
+  def close(self):
+    # Detach this process from the shared block
+    self._buf = None
+    self._shm.close()
+
+  def unlink(self):
+    # Destroy the shared block; call once, from the creating process, after every process closed it
+    self._shm.unlink()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+# Test the implementation of SharedMemoryQueue class
+
+def test_shared_memory_queue():
+    producer = SharedMemoryQueue.create(16)
+    consumer = SharedMemoryQueue.attach(producer.name)
+
+    # Test records passing between two handles of the same block
+    producer.put(b'hello')
+    producer.put(b'')
+    print(consumer.get(), consumer.get())  # Expected output: b'hello' b''
+
+    # Test wraparound and a full ring
+    producer.put(b'abcdefgh')
+    print(consumer.get())  # Expected output: b'abcdefgh'
+    producer.put(b'0123456789')
+    try:
+        producer.put(b'x')
+    except Full as e:
+        print(e)  # Expected output: "Queue is full"
+    print(consumer.get())  # Expected output: b'0123456789'
+    print(consumer.is_empty())  # Expected output: True
+
+    # Test a separate process attaching by name, reading a record and exiting
+    import subprocess
+    producer.put(b'spawned')
+    child = subprocess.run([sys.executable, __file__, 'consume', producer.name],
+                           capture_output=True, text=True, check=True)
+    print(child.stdout.strip())  # Expected output: spawned
+    again = SharedMemoryQueue.attach(producer.name) # the block survived the child's exit
+    print(again.is_empty())  # Expected output: True
+    again.close()
+
+    consumer.close()
+    producer.close()
+    producer.unlink()
+
+if __name__ == '__main__':
+  if sys.argv[1:2] == ['consume']:
+    # Consumer process started by the test: attach by name, print one record and exit
+    queue = SharedMemoryQueue.attach(sys.argv[2])
+    print(queue.get().decode())
+    queue.close()
+  else:
+    test_shared_memory_queue()
@@ -0,0 +1,217 @@
+# Implementing a queue that spills to disk
+
+"""
+A FIFO queue for backlogs that may not fit in memory. The oldest elements (the head)
+and the newest elements (the tail) stay in memory, each up to memory_limit elements.
+When the tail fills up while older elements are still waiting, it is written as one
+append-only segment file, so the middle of the queue lives on disk. Once the head runs
+empty the oldest segment is memory-mapped, read back into the head and deleted.
+
+Order of the elements, from first to last:  head -> segment files -> tail
+
+Segment files hold pickled elements, each preceded by its length as a 4-byte unsigned
+integer, and are named by an increasing sequence number. close() writes the in-memory
+elements to segments as well, so a new queue opened on the same directory recovers the
+whole backlog in order.
+
+A segment is written under a temporary name and renamed into place, so a crash never
+leaves a truncated segment behind. A segment read back into the head is deleted only
+once all of its elements were dequeued, so after a crash the elements of that segment
+may be delivered again. Elements that were never spilled are lost in a crash unless
+close() was called.
+
+The operations that we perform on the queue:
+1) len()
+2) is_empty()
+3) first()
+4) dequeue()
+5) enqueue()
+6) close()
+
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from collections import deque
+
+class Empty(Exception):
+  pass
+
+class SpillingQueue:
+
+  DEFAULT_MEMORY_LIMIT = 10000
+  LENGTH = struct.Struct('<I') # length prefix of every pickled element
+  SUFFIX = '.seg'
+  TEMPORARY = '.tmp' # appended to a segment name while it is being written
+
+  def __init__(self, directory, memory_limit=DEFAULT_MEMORY_LIMIT):
+    # Create a queue spilling into directory, recovering any segments already stored there
+    if memory_limit < 1:
+      raise ValueError('memory_limit must be positive')
+    os.makedirs(directory, exist_ok=True)
+    self._directory = directory
+    self._memory_limit = memory_limit
+    self._head = deque()
+    self._tail = deque()
+    self._segments = deque() # (sequence number, element count) of every segment, oldest first
+    self._loaded = None # sequence number of the segment the head was read from, if any
+    self._size = 0
+    self.recover()
+
+  def path(self, sequence):
+    # Return the file path of the segment with the given sequence number
+    return os.path.join(self._directory, f'{sequence}{self.SUFFIX}')
+
+  def recover(self):
+    # Register the segment files found in the directory, in sequence order, and remove
+    # temporary files left by a spill that was interrupted
+    for name in os.listdir(self._directory):
+      if name.endswith(self.SUFFIX + self.TEMPORARY):
+        os.remove(os.path.join(self._directory, name))
+    sequences = sorted(int(name[:-len(self.SUFFIX)]) for name in os.listdir(self._directory) if name.endswith(self.SUFFIX))
+    for sequence in sequences:
+      count = sum(1 for _ in self.records(sequence))
+      self._segments.append((sequence, count))
+      self._size += count
+
+  def records(self, sequence):
+    # Generate the pickled records of a segment, reading the file through a memory map
+    with open(self.path(sequence), 'rb') as f:
+      if os.fstat(f.fileno()).st_size == 0:
+        return
+      with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        offset = 0
+        while offset < len(view):
+          length = self.LENGTH.unpack_from(view, offset)[0]
+          offset += self.LENGTH.size
+          yield view[offset:offset + length]
+          offset += length
+
+  def next_sequence(self):
+    # Return the sequence number for a new segment after every segment still on disk
+    last = self._segments[-1][0] if self._segments else self._loaded
+    return last + 1 if last is not None else 0
+
+  def spill(self, elements, sequence):
+    # Write elements as a new segment file with the given sequence number
+    chunks = []
+    for element in elements:
+      record = pickle.dumps(element, pickle.HIGHEST_PROTOCOL)
+      chunks.append(self.LENGTH.pack(len(record)))
+      chunks.append(record)
+    path = self.path(sequence)
+    with open(path + self.TEMPORARY, 'wb') as f:
+      f.write(b''.join(chunks))
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace(path + self.TEMPORARY, path) # the segment appears complete or not at all
+
+  def __len__(self):
+    # Return the number of elements in the queue
+    return self._size
+
+  def is_empty(self):
+    # Return True if the queue is empty, False otherwise
+    return self._size == 0
+
+  def refill(self):
+    # Load the next elements into the empty head: the oldest segment, or else the tail.
+    # The segment file stays on disk until the head is drained again
+    if self._segments:
+      sequence, _ = self._segments.popleft()
+      self._head.extend(pickle.loads(record) for record in self.records(sequence))
+      self._loaded = sequence
+    else:
+      self._head, self._tail = self._tail, self._head
+
+  def first(self):
+    # Return the element at the front of the queue without removing it
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    if not self._head:
+      self.refill()
+    return self._head[0]
+
+  def dequeue(self):
+    # Remove and return the element at the front of the queue
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    if not self._head:
+      self.refill()
+    self._size -= 1
+    element = self._head.popleft()
+    if not self._head and self._loaded is not None:
+      os.remove(self.path(self._loaded)) # every element of the segment was dequeued
+      self._loaded = None
+    return element
+
+  def enqueue(self, item):
+    # Add an element to the end of the queue, spilling the tail to disk when it is full
+    if not self._segments and not self._tail and len(self._head) < self._memory_limit:
+      self._head.append(item) # nothing is waiting between head and tail yet
+    else:
+      self._tail.append(item)
+      if len(self._tail) >= self._memory_limit:
+        sequence = self.next_sequence()
+        self.spill(self._tail, sequence)
+        self._segments.append((sequence, len(self._tail)))
+        self._tail = deque()
+    self._size += 1
+
+  def close(self):
+    # Write the in-memory head and tail to segments so the backlog survives a restart
+    if self._head:
+      if self._loaded is not None:
+        sequence = self._loaded # overwrite the segment with the elements still pending
+        self._loaded = None
+      else:
+        sequence = self._segments[0][0] - 1 if self._segments else 0
+      self.spill(self._head, sequence)
+      self._segments.appendleft((sequence, len(self._head)))
+      self._head = deque()
+    if self._tail:
+      sequence = self.next_sequence()
+      self.spill(self._tail, sequence)
+      self._segments.append((sequence, len(self._tail)))
+      self._tail = deque()
+
+
+# Test the implementation of SpillingQueue class
+
+def test_spilling_queue():
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SpillingQueue(directory, memory_limit=3)
+
+        # Test enqueue beyond the memory limit spills segments to disk
+        for k in range(10):
+            queue.enqueue(k)
+        print(len(queue))  # Expected output: 10
+        print(len(os.listdir(directory)))  # Expected output: 2
+        print(queue.first())  # Expected output: 0
+
+        # Test dequeue keeps FIFO order through head, segments and tail
+        print([queue.dequeue() for _ in range(5)])  # Expected output: [0, 1, 2, 3, 4]
+
+        # Test recovery after close
+        queue.close()
+        recovered = SpillingQueue(directory, memory_limit=3)
+        print(len(recovered))  # Expected output: 5
+        print([recovered.dequeue() for _ in range(5)])  # Expected output: [5, 6, 7, 8, 9]
+        print(recovered.is_empty())  # Expected output: True
+
+        # Test a crash while a segment is being read back redelivers that segment, and an
+        # interrupted spill is discarded
+        queue = SpillingQueue(directory, memory_limit=2)
+        for k in range(6):
+            queue.enqueue(k)
+        print([queue.dequeue() for _ in range(3)])  # Expected output: [0, 1, 2]
+        with open(os.path.join(directory, '9.seg.tmp'), 'wb') as f:
+            f.write(b'\x05\x00')
+        crashed = SpillingQueue(directory, memory_limit=2) # the first queue was never closed
+        print([crashed.dequeue() for _ in range(len(crashed))])  # Expected output: [2, 3, 4, 5]
+        print(sorted(os.listdir(directory)))  # Expected output: []
+
+test_spilling_queue()
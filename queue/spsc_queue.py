@@ -0,0 +1,138 @@
+# Single-producer/single-consumer queue for threads
+
+"""
+A bounded queue that one producer thread and one consumer thread can use at the same
+time without a lock. The elements live in a ring of power-of-two capacity, so a slot is
+found by masking an ever-increasing index. The producer is the only writer of _tail and
+the consumer the only writer of _head; there is no shared size counter that both would
+update. The producer stores the element before publishing the new _tail, and the
+consumer reads the element before publishing the new _head, so neither side ever sees
+a slot that the other one is still using.
+
+The operations that we perform on the queue:
+1) len()
+2) is_empty()
+3) first()                 (consumer)
+4) offer() / enqueue()     (producer)
+5) poll() / dequeue()      (consumer)
+
+"""
+
+import threading
+import time
+
+class Empty(Exception):
+  pass
+
+class Full(Exception):
+  pass
+
+class SPSCQueue:
+
+  DEFAULT_CAPACITY = 1024
+
+  def __init__(self, capacity=DEFAULT_CAPACITY):
+    # Create an empty queue; capacity is rounded up to a power of two
+    if capacity < 1:
+      raise ValueError('capacity must be positive')
+    capacity = 1 << (capacity - 1).bit_length()
+    self._data = [None]*capacity
+    self._mask = capacity - 1
+    self._head = 0 # index of the next element to read, written by the consumer only
+    self._tail = 0 # index of the next free slot, written by the producer only
+
+  def __len__(self):
+    # Return the number of elements in the queue (a snapshot when both threads are active)
+    return self._tail - self._head
+
+  def capacity(self):
+    # Return the maximum number of elements the queue can hold
+    return self._mask + 1
+
+  def is_empty(self):
+    # Return True if the queue is empty, False otherwise
+    return self._tail == self._head
+
+  def offer(self, item):
+    # Add an element to the end of the queue; return False if the queue is full
+    tail = self._tail
+    if tail - self._head > self._mask:
+      return False
+    self._data[tail & self._mask] = item
+    self._tail = tail + 1 # publish the element to the consumer
+    return True
+
+  def enqueue(self, item):
+    # Add an element to the end of the queue, raise Full if there is no room
+    if not self.offer(item):
+      raise Full('Queue is full')
+
+  def poll(self, default=None):
+    # Remove and return the element at the front of the queue, or default if it is empty
+    head = self._head
+    if head == self._tail:
+      return default
+    slot = head & self._mask
+    element = self._data[slot]
+    self._data[slot] = None # After removing element from queue place None in that location to maintain data integrity
+    self._head = head + 1 # hand the slot back to the producer
+    return element
+
+  def dequeue(self):
+    # Remove and return the element at the front of the queue, raise Empty if there is none
+    if self._head == self._tail:
+      raise Empty('Queue is empty')
+    return self.poll()
+
+  def first(self):
+    # Return the element at the front of the queue without removing it
+    if self._head == self._tail:
+      raise Empty('Queue is empty')
+    return self._data[self._head & self._mask]
+
+
+# Test the implementation of SPSCQueue class
+
+def test_spsc_queue():
+    queue = SPSCQueue(3)
+
+    # Test capacity rounding and full/empty behaviour
+    print(queue.capacity())  # Expected output: 4
+    for k in range(4):
+        queue.enqueue(k)
+    print(queue.offer(4))  # Expected output: False
+    print(queue.dequeue(), queue.first())  # Expected output: 0 1
+    print(len(queue))  # Expected output: 3
+
+    # Test one producer and one consumer thread sharing the queue
+    queue = SPSCQueue(16)
+    n = 10000
+    received = []
+    missing = object()
+    done = object()
+
+    def produce():
+        for k in range(n):
+            while not queue.offer(k):
+                time.sleep(0) # yield to the consumer while the queue is full
+        while not queue.offer(done):
+            time.sleep(0)
+
+    def consume():
+        while True:
+            element = queue.poll(missing)
+            if element is done:
+                return
+            if element is missing:
+                time.sleep(0) # yield to the producer while the queue is empty
+            else:
+                received.append(element)
+
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(received == list(range(n)))  # Expected output: True
+
+test_spsc_queue()
@@ -5,6 +5,8 @@ class Empty(Exception):
 
 class LinkedStack:
   class Node: # Single linked node to store the element
+    __slots__ = ('element', 'next') # streamline memory usage
+
     def __init__(self, element, next):
       self.element = element
       self.next = next
@@ -0,0 +1,291 @@
+# Implementing a Sorted Map with an AVL Tree
+
+"""
+A sorted map stored in a LinkedBinaryTree that is kept height-balanced: at every
+position the heights of the two subtrees differ by at most one. Whenever an insertion
+or a deletion breaks that rule, a trinode restructuring made of one or two rotations
+restores it, so the height stays O(log n) even for sorted insertion streams and every
+operation below runs in O(log n) time.
+
+The operations that we can perform on the map:
+1) M[k], M[k] = v, del M[k]
+2) len, iter (keys in increasing order), k in M
+3) find_min(), find_max()
+4) find_le(k), find_ge(k)
+5) find_range(start, stop)
+
+"""
+
+from collections.abc import MutableMapping
+
+from tree.tree import LinkedBinaryTree
+
+class AVLTreeMap(LinkedBinaryTree, MutableMapping):
+
+  class Item:
+    # Key-value pair stored as the element of a position
+    __slots__ = ('key', 'value') # streamline memory usage
+
+    def __init__(self, key, value):
+      self.key = key
+      self.value = value
+
+  class Node(LinkedBinaryTree.Node):
+    __slots__ = ('height',)
+
+    def __init__(self, element, parent=None, left=None, right=None):
+      super().__init__(element, parent, left, right)
+      self.height = 1 # height of the subtree rooted at this node, counting nodes
+
+# ------------ Rotation primitives --------------
+
+  def height_of(self, node):
+    return node.height if node is not None else 0
+
+  def recompute_height(self, node):
+    node.height = 1 + max(self.height_of(node.left), self.height_of(node.right))
+
+  def is_balanced(self, node):
+    return abs(self.height_of(node.left) - self.height_of(node.right)) <= 1
+
+  def tall_child(self, node, favor_left=False):
+    # Return the child of node with the larger height, breaking ties as favor_left says
+    if self.height_of(node.left) + (1 if favor_left else 0) > self.height_of(node.right):
+      return node.left
+    return node.right
+
+  def tall_grandchild(self, node):
+    # Return the taller grandchild of node, preferring one aligned with its parent
+    child = self.tall_child(node)
+    return self.tall_child(child, child is node.left)
+
+  def relink(self, parent, child, make_left_child):
+    # Make child the left or right child of parent
+    if make_left_child:
+      parent.left = child
+    else:
+      parent.right = child
+    if child is not None:
+      child.parent = parent
+
+  def rotate(self, x):
+    # Rotate node x above its parent
+    y = x.parent
+    z = y.parent
+    if z is None:
+      self._root = x
+      x.parent = None
+    else:
+      self.relink(z, x, y is z.left)
+    if x is y.left:
+      self.relink(y, x.right, True)
+      self.relink(x, y, False)
+    else:
+      self.relink(y, x.left, False)
+      self.relink(x, y, True)
+
+  def restructure(self, x):
+    # Perform a trinode restructuring of x with its parent and grandparent and return
+    # the node that ends up on top
+    y = x.parent
+    z = y.parent
+    if (x is y.right) == (y is z.right):
+      self.rotate(y) # single rotation
+      return y
+    self.rotate(x) # double rotation
+    self.rotate(x)
+    return x
+
+  def rebalance(self, node):
+    # Restore balance and heights from node up to the root, stopping once a subtree's
+    # height is unchanged since its ancestors cannot be affected
+    while node is not None:
+      old_height = node.height
+      if not self.is_balanced(node):
+        node = self.restructure(self.tall_grandchild(node))
+        self.recompute_height(node.left)
+        self.recompute_height(node.right)
+      self.recompute_height(node)
+      if node.height == old_height:
+        return
+      node = node.parent
+
+# ------------ Searching --------------
+
+  def search_node(self, k):
+    # Return the node with key k, or the last node visited if there is none
+    node = self._root
+    while True:
+      key = node.element.key
+      if k == key:
+        return node
+      child = node.left if k < key else node.right
+      if child is None:
+        return node
+      node = child
+
+  def find_node_ge(self, k):
+    # Return the node with the smallest key >= k, or None
+    node = self._root
+    best = None
+    while node is not None:
+      if node.element.key < k:
+        node = node.right
+      else:
+        best = node
+        node = node.left
+    return best
+
+  def find_node_le(self, k):
+    # Return the node with the largest key <= k, or None
+    node = self._root
+    best = None
+    while node is not None:
+      if k < node.element.key:
+        node = node.left
+      else:
+        best = node
+        node = node.right
+    return best
+
+  def pair(self, node):
+    # Return the (key, value) pair stored at node, or None if node is None
+    return (node.element.key, node.element.value) if node is not None else None
+
+  def find_min(self):
+    # Return the (key, value) pair with minimum key, or None if the map is empty
+    if self._root is None:
+      return None
+    return self.pair(self.first_inorder_node(self._root))
+
+  def find_max(self):
+    # Return the (key, value) pair with maximum key, or None if the map is empty
+    node = self._root
+    if node is None:
+      return None
+    while node.right is not None:
+      node = node.right
+    return self.pair(node)
+
+  def find_le(self, k):
+    # Return the (key, value) pair with the largest key <= k, or None
+    return self.pair(self.find_node_le(k))
+
+  def find_ge(self, k):
+    # Return the (key, value) pair with the smallest key >= k, or None
+    return self.pair(self.find_node_ge(k))
+
+  def find_range(self, start, stop):
+    # Generate the (key, value) pairs with start <= key < stop in key order. A start of
+    # None begins at the minimum key and a stop of None runs to the maximum key
+    if self._root is None:
+      return
+    node = self.first_inorder_node(self._root) if start is None else self.find_node_ge(start)
+    while node is not None and (stop is None or node.element.key < stop):
+      yield (node.element.key, node.element.value)
+      node = self.successor_node(node)
+
+# ------------ Map operations --------------
+
+  def __getitem__(self, k):
+    # Return the value associated with key k, raise KeyError if there is none
+    if self._root is not None:
+      node = self.search_node(k)
+      if node.element.key == k:
+        return node.element.value
+    raise KeyError('Key Error: ' + repr(k))
+
+  def __setitem__(self, k, v):
+    # Assign value v to key k, overwriting the existing value if present
+    if self._root is None:
+      self.add_root(self.Item(k, v))
+      return
+    node = self.search_node(k)
+    if node.element.key == k:
+      node.element.value = v
+      return
+    p = self.make_position(node)
+    if k < node.element.key:
+      self.add_left(p, self.Item(k, v))
+    else:
+      self.add_right(p, self.Item(k, v))
+    self.rebalance(node)
+
+  def __delitem__(self, k):
+    # Remove the item with key k, raise KeyError if there is none
+    if self._root is not None:
+      node = self.search_node(k)
+      if node.element.key == k:
+        if node.left is not None and node.right is not None:
+          # Move the item of the inorder predecessor here and delete the predecessor instead
+          predecessor = node.left
+          while predecessor.right is not None:
+            predecessor = predecessor.right
+          node.element = predecessor.element
+          node = predecessor
+        parent = node.parent
+        self.delete(self.make_position(node))
+        self.rebalance(parent)
+        return
+    raise KeyError('Key Error: ' + repr(k))
+
+  def __iter__(self):
+    # Generate the keys of the map in increasing order
+    for node in self.inorder_nodes():
+      yield node.element.key
+
+  def __reversed__(self):
+    # Generate the keys of the map in decreasing order
+    stack = []
+    node = self._root
+    while stack or node is not None:
+      while node is not None:
+        stack.append(node)
+        node = node.right
+      node = stack.pop()
+      yield node.element.key
+      node = node.left
+
+  def __contains__(self, k):
+    # Return True if key k is in the map
+    if self._root is None:
+      return False
+    return self.search_node(k).element.key == k
+
+
+# Test the implementation of AVLTreeMap class
+
+def test_avl_tree_map():
+    tree_map = AVLTreeMap()
+
+    # Test a sorted insertion stream stays balanced
+    for k in range(1000):
+      tree_map[k] = str(k)
+    assert len(tree_map) == 1000
+    assert tree_map._root.height <= 11
+    assert list(tree_map)[:5] == [0, 1, 2, 3, 4]
+
+    # Test lookups, updates and ordered queries
+    tree_map[500] = 'five hundred'
+    assert tree_map[500] == 'five hundred' and 500 in tree_map
+    assert tree_map.find_le(-1) is None and tree_map.find_ge(1000) is None
+    assert tree_map.find_le(10.5) == (10, '10') and tree_map.find_ge(10.5) == (11, '11')
+    assert list(tree_map.find_range(3, 6)) == [(3, '3'), (4, '4'), (5, '5')]
+    assert tree_map.find_min() == (0, '0') and tree_map.find_max() == (999, '999')
+    assert AVLTreeMap() == AVLTreeMap() == {} and tree_map != AVLTreeMap()
+
+    # Test deletion keeps the tree balanced
+    for k in range(0, 1000, 2):
+      del tree_map[k]
+    assert len(tree_map) == 500 and 2 not in tree_map
+    assert list(tree_map.find_range(None, 8)) == [(1, '1'), (3, '3'), (5, '5'), (7, '7')]
+    assert tree_map._root.height <= 10
+    try:
+      del tree_map[2]
+      assert False
+    except KeyError:
+      pass
+
+    print("All tests passed!")
+
+test_avl_tree_map()
@@ -14,26 +14,29 @@ The operations that we can perform on Tree:
 4) children(p)
 5) is_empty()
 6) len
-7) iter
+7) iter (elements in the order of positions(), which is preorder unless a subclass changes it)
 8) is_root(e)
 9) is_leaf(e)
 10) positions()
 
 """
 
+from collections import deque
+
 class Tree:
 
   class Position:
+    __slots__ = ()
 
     def element(self):
       # Return the element stored at this position
       return NotImplementedError('must be implemented by subclass')
 
-    def __equal__(self, other):
+    def __eq__(self, other):
       # Return true if other position represents the same location
-      return NotImplementedError('must be implemented by subclass')
+      raise NotImplementedError('must be implemented by subclass')
     
-    def __noteqaul__(self, other):
+    def __ne__(self, other):
       # Return true if other position does not represent the same location
       return not (self == other)
     
@@ -72,6 +75,67 @@ class Tree:
   def is_empty(self):
     # Return true if the tree is empty
     return len(self) == 0
+
+  def depth(self, p):
+    # Return the number of ancestors of p, excluding p itself
+    count = 0
+    while not self.is_root(p):
+      p = self.parent(p)
+      count += 1
+    return count
+
+  def height(self, p=None):
+    # Return the height of the subtree rooted at p (the whole tree by default)
+    if p is None:
+      if self.is_empty():
+        return 0
+      p = self.root()
+    best = 0
+    stack = [(p, 0)]
+    while stack:
+      p, level = stack.pop()
+      best = max(best, level)
+      stack.extend((c, level + 1) for c in self.children(p))
+    return best
+
+  def __iter__(self):
+    # Generate an iteration of the tree's elements
+    for p in self.positions():
+      yield p.element()
+
+  def positions(self):
+    # Generate an iteration of the tree's positions
+    return self.preorder()
+
+  def preorder(self):
+    # Generate a preorder iteration of positions, using an explicit stack instead of recursion
+    if not self.is_empty():
+      stack = [self.root()]
+      while stack:
+        p = stack.pop()
+        yield p
+        stack.extend(reversed(list(self.children(p))))
+
+  def postorder(self):
+    # Generate a postorder iteration of positions, using an explicit stack instead of recursion
+    if not self.is_empty():
+      stack = [(self.root(), False)]
+      while stack:
+        p, expanded = stack.pop()
+        if expanded:
+          yield p
+        else:
+          stack.append((p, True))
+          stack.extend((c, False) for c in reversed(list(self.children(p))))
+
+  def breadthfirst(self):
+    # Generate a breadth-first iteration of the positions of the tree
+    if not self.is_empty():
+      fringe = deque([self.root()])
+      while fringe:
+        p = fringe.popleft()
+        yield p
+        fringe.extend(self.children(p))
   
 
 # The BinaryTree Abstract Base Class in Python
@@ -107,6 +171,18 @@ class BinaryTree(Tree):
       yield self.left(p)
     if self.right(p) is not None:
       yield self.right(p)
+
+  def inorder(self):
+    # Generate an inorder iteration of positions, using an explicit stack instead of recursion
+    stack = []
+    p = self.root()
+    while stack or p is not None:
+      while p is not None:
+        stack.append(p)
+        p = self.left(p)
+      p = stack.pop()
+      yield p
+      p = self.right(p)
     
 
 # Linked Binary Tree imPlimentation
@@ -114,6 +190,8 @@ class BinaryTree(Tree):
 class LinkedBinaryTree(BinaryTree):
 
   class Node:
+    __slots__ = ('element', 'parent', 'left', 'right') # streamline memory usage
+
     def __init__(self, element, parent=None, left=None, right=None):
       self.element = element
       self.parent = parent
@@ -121,6 +199,8 @@ class LinkedBinaryTree(BinaryTree):
       self.right = right
 
   class Position(BinaryTree.Position):
+    __slots__ = ('container', 'node')
+
     def __init__(self, container, node):
       self.container = container
       self.node = node
@@ -129,9 +209,12 @@ class LinkedBinaryTree(BinaryTree):
       # Return the element stored at this position
       return self.node.element
 
-    def __equal__(self, other):
+    def __eq__(self, other):
       # Return true if other position represents the same location
       return type(other) is type(self) and other.node is self.node
+
+    def __hash__(self):
+      return hash(self.node)
     
   def validate(self, p):
     # Return the position of the node
@@ -139,7 +222,7 @@ class LinkedBinaryTree(BinaryTree):
       raise TypeError('p must be a Position instance')
     if p.container is not self:
       raise ValueError('p does not belong to this container')
-    if p.node.next is None:
+    if p.node.parent is p.node: # convention for deprecated nodes
       raise ValueError('p is no longer valid')
     return p.node
   
@@ -150,18 +233,18 @@ class LinkedBinaryTree(BinaryTree):
 # ------------ Binary Tree Constructor --------------
 
   def __init__(self):
-    self.root = None
-    self.size = 0
+    self._root = None
+    self._size = 0
 
   def __len__(self):
-    return self.size
+    return self._size
 
   def root(self):
-    return self.make_position(self.root)
+    return self.make_position(self._root)
   
   def parent(self, p):
     node = self.validate(p)
-    return self.make_position(node)
+    return self.make_position(node.parent)
   
   def left(self, p):
     node = self.validate(p)
@@ -182,18 +265,18 @@ class LinkedBinaryTree(BinaryTree):
   
   def add_root(self, e):
     # Create root for empty tree storing e as element and return the position of that root
-    if self.root is not None:
+    if self._root is not None:
       raise ValueError('root is present')
-    self.size = 1
-    self.root = self.Node(e)
-    return self.make_position(self.root)
+    self._size = 1
+    self._root = self.Node(e)
+    return self.make_position(self._root)
   
   def add_left(self, p, e):
     # Create a new left child for Position p, storing element e. Return the Position of new node.
     node = self.validate(p)
     if node.left is not None:
       raise ValueError('left child already exists')
-    self.size += 1
+    self._size += 1
     node.left = self.Node(e, node)
     return self.make_position(node.left)
   
@@ -202,7 +285,7 @@ class LinkedBinaryTree(BinaryTree):
     node = self.validate(p)
     if node.right is not None:
       raise ValueError('right child already exists')
-    self.size += 1
+    self._size += 1
     node.right = self.Node(e, node)
     return self.make_position(node.right)
   
@@ -221,15 +304,15 @@ class LinkedBinaryTree(BinaryTree):
     child = node.left if node.left else node.right
     if child is not None:
       child.parent = node.parent
-    if node is self.root:
-      self.root = child
+    if node is self._root:
+      self._root = child
     else:
       parent = node.parent
       if node is parent.left:
         parent.left = child
       else:
         parent.right = child
-    self.size -= 1
+    self._size -= 1
     node.parent = node
     return node.element
   
@@ -240,16 +323,457 @@ class LinkedBinaryTree(BinaryTree):
       raise ValueError('p must be an external position')
     if not type(self) is type(t1) is type(t2):
       raise TypeError('Trees must be of the same type')
-    self.size += len(t1) + len(t2)
+    self._size += len(t1) + len(t2)
     if not t1.is_empty():
-      t1.root.parent = node
-      node.left = t1.root
-      t1.root = None
-      t1.size = 0
+      t1._root.parent = node
+      node.left = t1._root
+      t1._root = None
+      t1._size = 0
     if not t2.is_empty():
-      t2.root.parent = node
-      node.right = t2.root
-      t2.root = None
-      t2.size = 0
+      t2._root.parent = node
+      node.right = t2._root
+      t2._root = None
+      t2._size = 0
+
+
+
+# ------------ Traversals walking the nodes directly --------------
+
+  def preorder_nodes(self):
+    # Generate the nodes in preorder with an explicit stack of pending right subtrees
+    stack = [self._root] if self._root is not None else []
+    while stack:
+      node = stack.pop()
+      yield node
+      if node.right is not None:
+        stack.append(node.right)
+      if node.left is not None:
+        stack.append(node.left)
+
+  def postorder_nodes(self):
+    # Generate the nodes in postorder, using the last visited node to tell whether the
+    # right subtree of the node on top of the stack is already done
+    stack = []
+    node = self._root
+    last = None
+    while stack or node is not None:
+      if node is not None:
+        stack.append(node)
+        node = node.left
+      else:
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+          node = top.right
+        else:
+          last = stack.pop()
+          yield last
+
+  def inorder_nodes(self):
+    # Generate the nodes in inorder with an explicit stack of ancestors
+    stack = []
+    node = self._root
+    while stack or node is not None:
+      while node is not None:
+        stack.append(node)
+        node = node.left
+      node = stack.pop()
+      yield node
+      node = node.right
+
+  def first_inorder_node(self, node):
+    # Return the leftmost node of the subtree rooted at node
+    while node.left is not None:
+      node = node.left
+    return node
+
+  def successor_node(self, node):
+    # Return the node following node in inorder, or None if node is the last one
+    if node.right is not None:
+      return self.first_inorder_node(node.right)
+    child = node
+    node = node.parent
+    while node is not None and child is node.right:
+      child = node
+      node = node.parent
+    return node
+
+  def successor_inorder_nodes(self):
+    # Generate the nodes in inorder with O(1) extra memory by following parent links
+    # instead of keeping a stack. The tree is only read, so any number of these walks
+    # can run over the same tree at once
+    if self._root is None:
+      return
+    node = self.first_inorder_node(self._root)
+    while node is not None:
+      yield node
+      node = self.successor_node(node)
+
+  def successor(self, p):
+    # Return the position following p in inorder, or None if p is the last position
+    return self.make_position(self.successor_node(self.validate(p)))
+
+  def breadthfirst_nodes(self):
+    # Generate the nodes level by level with a queue holding the next nodes to visit
+    fringe = deque([self._root] if self._root is not None else [])
+    while fringe:
+      node = fringe.popleft()
+      yield node
+      if node.left is not None:
+        fringe.append(node.left)
+      if node.right is not None:
+        fringe.append(node.right)
+
+  def preorder(self):
+    # Generate a preorder iteration of positions
+    for node in self.preorder_nodes():
+      yield self.Position(self, node)
+
+  def postorder(self):
+    # Generate a postorder iteration of positions
+    for node in self.postorder_nodes():
+      yield self.Position(self, node)
+
+  def inorder(self):
+    # Generate an inorder iteration of positions
+    for node in self.inorder_nodes():
+      yield self.Position(self, node)
+
+  def breadthfirst(self):
+    # Generate a breadth-first iteration of positions
+    for node in self.breadthfirst_nodes():
+      yield self.Position(self, node)
+
+  def __iter__(self):
+    # Generate the elements in preorder, the order of positions(), without creating any Position
+    for node in self.preorder_nodes():
+      yield node.element
+
+
+# Linked Binary Tree keeping subtree size, height and depth in every node. Each edit walks
+# from the changed node up to the root to refresh sizes and heights, so add_left,
+# add_right, delete and attach cost O(depth). Depths are stored too; delete and attach
+# relabel the subtree that moves, in time proportional to its size
+
+class AugmentedLinkedBinaryTree(LinkedBinaryTree):
+
+  class Node(LinkedBinaryTree.Node):
+    __slots__ = ('size', 'height', 'depth')
+
+    def __init__(self, element, parent=None, left=None, right=None):
+      super().__init__(element, parent, left, right)
+      self.size = 1
+      self.height = 0
+      self.depth = parent.depth + 1 if parent is not None else 0
+
+  def refresh(self, node):
+    # Recompute size and height of node and of all its ancestors
+    while node is not None:
+      left, right = node.left, node.right
+      node.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+      node.height = 1 + max(left.height if left is not None else -1, right.height if right is not None else -1)
+      node = node.parent
+
+  def relabel(self, node, depth):
+    # Set the depths of the subtree rooted at node, starting with depth at node
+    stack = [(node, depth)]
+    while stack:
+      node, depth = stack.pop()
+      node.depth = depth
+      if node.left is not None:
+        stack.append((node.left, depth + 1))
+      if node.right is not None:
+        stack.append((node.right, depth + 1))
+
+  def add_left(self, p, e):
+    position = super().add_left(p, e)
+    self.refresh(position.node.parent)
+    return position
+
+  def add_right(self, p, e):
+    position = super().add_right(p, e)
+    self.refresh(position.node.parent)
+    return position
+
+  def delete(self, p):
+    node = self.validate(p)
+    parent = node.parent
+    child = node.left if node.left is not None else node.right
+    element = super().delete(p)
+    if child is not None:
+      self.relabel(child, node.depth)
+    self.refresh(parent)
+    return element
+
+  def attach(self, p, t1, t2):
+    node = self.validate(p)
+    super().attach(p, t1, t2)
+    for child in (node.left, node.right):
+      if child is not None:
+        self.relabel(child, node.depth + 1)
+    self.refresh(node)
+
+  def subtree_size(self, p):
+    # Return the number of positions in the subtree rooted at p in O(1) time
+    return self.validate(p).size
+
+  def height(self, p=None):
+    # Return the height of the subtree rooted at p (the whole tree by default) in O(1) time
+    node = self._root if p is None else self.validate(p)
+    return node.height if node is not None else 0
+
+  def depth(self, p):
+    # Return the number of ancestors of p in O(1) time
+    return self.validate(p).depth
+
+  def balance(self, p):
+    # Return the height of the left subtree of p minus the height of its right subtree
+    node = self.validate(p)
+    left = node.left.height if node.left is not None else -1
+    right = node.right.height if node.right is not None else -1
+    return left - right
+
+  def select(self, k):
+    # Return the position of the k-th element in inorder (counting from 0) in O(height) time
+    if not 0 <= k < self._size:
+      raise IndexError('tree index out of range')
+    node = self._root
+    while True:
+      left = node.left.size if node.left is not None else 0
+      if k < left:
+        node = node.left
+      elif k == left:
+        return self.make_position(node)
+      else:
+        k -= left + 1
+        node = node.right
+
+
+# Array-Based Complete Binary Tree
+
+"""
+A complete binary tree stored level by level in one Python list, as in a heap. The
+position of an element is just its index: the root is 0, the children of p are 2p+1 and
+2p+2 and its parent is (p-1)//2, so no node objects or pointers are allocated and the
+walks touch one contiguous list. Elements are added and removed only at the end of the
+last level, which keeps the tree complete.
+
+"""
+
+class ArrayBinaryTree(BinaryTree):
+
+  def __init__(self, elements=()):
+    # Create a complete tree holding elements in level order
+    self._data = list(elements)
+
+  def __len__(self):
+    return len(self._data)
+
+  def validate(self, p):
+    # Return the index p after checking it names a position of the tree
+    if type(p) is not int:
+      raise TypeError('p must be an integer index')
+    if not 0 <= p < len(self._data):
+      raise ValueError('p is not a position of this tree')
+    return p
+
+  def element(self, p):
+    # Return the element stored at position p
+    return self._data[self.validate(p)]
+
+  def root(self):
+    return 0 if self._data else None
+
+  def parent(self, p):
+    p = self.validate(p)
+    return (p - 1) // 2 if p > 0 else None
+
+  def left(self, p):
+    child = 2 * self.validate(p) + 1
+    return child if child < len(self._data) else None
+
+  def right(self, p):
+    child = 2 * self.validate(p) + 2
+    return child if child < len(self._data) else None
+
+  def sibling(self, p):
+    p = self.validate(p)
+    if p == 0:
+      return None
+    sibling = p + 1 if p % 2 == 1 else p - 1
+    return sibling if sibling < len(self._data) else None
+
+  def num_children(self, p):
+    return max(0, min(2, len(self._data) - 2 * self.validate(p) - 1))
+
+  def children(self, p):
+    first = 2 * self.validate(p) + 1
+    return range(first, min(first + 2, len(self._data)))
+
+  def depth(self, p):
+    # Return the number of ancestors of p in O(1) time
+    return (self.validate(p) + 1).bit_length() - 1
+
+  def height(self, p=None):
+    # Return the height of the subtree rooted at p (the whole tree by default) in O(1) time.
+    # The leftmost descendant h levels below p has index (p+1)*2**h - 1, so the height is
+    # the largest h with (p+1)*2**h <= len
+    if p is None:
+      if not self._data:
+        return 0
+      p = 0
+    return (len(self._data) // (self.validate(p) + 1)).bit_length() - 1
+
+  def add(self, e):
+    # Store e at the next free position of the last level and return that position
+    self._data.append(e)
+    return len(self._data) - 1
+
+  def delete_last(self):
+    # Remove the last position of the last level and return its element
+    if not self._data:
+      raise ValueError('tree is empty')
+    return self._data.pop()
+
+  def replace(self, p, e):
+    # Replace the element at position p with e and return the old element
+    p = self.validate(p)
+    old = self._data[p]
+    self._data[p] = e
+    return old
+
+  def breadthfirst(self):
+    # Positions in level order are simply the indices of the list
+    return iter(range(len(self._data)))
+
+  def __iter__(self):
+    # Generate the elements in the order of positions(); breadthfirst() gives level order
+    data = self._data
+    for p in self.positions():
+      yield data[p]
+
+# ------------------------------------------------------------------------------------------------
+
+# Test and Impliment LinkedBinaryTree class
+
+def test_linked_binary_tree():
+    # Build the tree       1
+    #                     / \
+    #                    2   3
+    #                   / \
+    #                  4   5
+    tree = LinkedBinaryTree()
+    root = tree.add_root(1)
+    left = tree.add_left(root, 2)
+    right = tree.add_right(root, 3)
+    tree.add_left(left, 4)
+    tree.add_right(left, 5)
+    assert len(tree) == 5
+    assert tree.parent(left) == root
+    assert tree.sibling(left) == right
+    assert tree.is_root(root) and tree.is_leaf(right)
+
+    # Test the traversals
+    assert [p.element() for p in tree.preorder()] == [1, 2, 4, 5, 3]
+    assert [p.element() for p in tree.postorder()] == [4, 5, 2, 3, 1]
+    assert [p.element() for p in tree.inorder()] == [4, 2, 5, 1, 3]
+    assert [p.element() for p in tree.breadthfirst()] == [1, 2, 3, 4, 5]
+    assert list(tree) == [p.element() for p in tree.positions()] == [1, 2, 4, 5, 3]
+    assert [node.element for node in tree.successor_inorder_nodes()] == [4, 2, 5, 1, 3]
+    assert tree.successor(tree.left(left)) == left and tree.successor(right) is None
+
+    # Test a degenerate tree deeper than the recursion limit
+    chain = LinkedBinaryTree()
+    p = chain.add_root(0)
+    for k in range(1, 5000):
+      p = chain.add_right(p, k)
+    assert list(chain) == list(range(5000))
+    assert [node.element for node in chain.successor_inorder_nodes()] == list(range(5000))
+    assert [q.element() for q in chain.postorder()] == list(range(4999, -1, -1))
+
+    # Test the cached subtree metadata
+    augmented = AugmentedLinkedBinaryTree()
+    root = augmented.add_root('b')
+    left = augmented.add_left(root, 'a')
+    right = augmented.add_right(root, 'd')
+    grandchild = augmented.add_left(right, 'c')
+    assert augmented.subtree_size(root) == 4 and augmented.height() == 2
+    assert augmented.depth(grandchild) == 2 and augmented.balance(root) == -1
+    assert [augmented.select(k).element() for k in range(4)] == ['a', 'b', 'c', 'd']
+    augmented.delete(right)
+    assert augmented.depth(grandchild) == 1 and augmented.height() == 1
+    t1 = AugmentedLinkedBinaryTree()
+    t1.add_left(t1.add_root('x'), 'y')
+    augmented.attach(left, t1, AugmentedLinkedBinaryTree())
+    assert augmented.subtree_size(root) == 5 and augmented.height() == 3
+    assert augmented.height(left) == 2 and augmented.depth(left) == 1
+
+    # Test the array-based complete tree, built in level order as the tree at the top
+    compact = ArrayBinaryTree([1, 2, 3, 4, 5])
+    assert compact.root() == 0 and compact.left(0) == 1 and compact.right(1) == 4
+    assert compact.parent(4) == 1 and compact.parent(0) is None
+    assert compact.sibling(1) == 2 and compact.sibling(4) == 3 and compact.right(2) is None
+    assert [compact.element(p) for p in compact.inorder()] == [4, 2, 5, 1, 3]
+    assert [compact.element(p) for p in compact.postorder()] == [4, 5, 2, 3, 1]
+    assert list(compact) == [compact.element(p) for p in compact.positions()] == [1, 2, 4, 5, 3]
+    assert list(compact.breadthfirst()) == [0, 1, 2, 3, 4]
+    assert compact.height() == 2 and compact.height(2) == 0 and compact.depth(4) == 2
+    assert compact.num_children(1) == 2 and compact.is_leaf(2)
+    assert compact.add(6) == 5 and compact.right(2) is None and list(compact.children(2)) == [5]
+    assert compact.replace(5, 7) == 6 and compact.delete_last() == 7 and len(compact) == 5
+
+    print("All tests passed!")
+
+# Run the test function
+test_linked_binary_tree()
+
+# ------------------------------------------------------------------------------------------------
+
+# Benchmark the stack-based and the parent-pointer inorder walks on skewed and balanced trees
+
+def benchmark_inorder(n=200000, repeat=3):
+    import timeit
+    import tracemalloc
+
+    def left_chain():
+      tree = LinkedBinaryTree()
+      p = tree.add_root(0)
+      for k in range(1, n):
+        p = tree.add_left(p, k)
+      return tree
+
+    def right_chain():
+      tree = LinkedBinaryTree()
+      p = tree.add_root(0)
+      for k in range(1, n):
+        p = tree.add_right(p, k)
+      return tree
+
+    def balanced():
+      tree = LinkedBinaryTree()
+      level = [tree.add_root(0)]
+      k = 1
+      while k < n:
+        following = []
+        for p in level:
+          for add in (tree.add_left, tree.add_right):
+            if k < n:
+              following.append(add(p, k))
+              k += 1
+        level = following
+      return tree
 
+    for shape, build in (('left chain', left_chain), ('right chain', right_chain), ('balanced', balanced)):
+      tree = build()
+      for name, walk in (('stack', tree.inorder_nodes), ('parent', tree.successor_inorder_nodes)):
+        def run():
+          for _ in walk():
+            pass
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{shape:>12} {name:>7}: {best / n * 1e9:7.1f} ns per node, {peak:>9} bytes peak extra memory")
 
+if __name__ == '__main__':
+    benchmark_inorder()